@@ -1,41 +1,61 @@
+import argparse
 import random
+import sys
+
+import hint_cache
+import move_log
+import puzzle_generator
+from eight_puzzle_table import optimal_distance, optimal_solution
+from puzzle_board import PuzzleBoard
+from puzzle_state import PackedState
+
+MAX_DIFFICULTY = 31  # The hardest 3x3 boards need 31 moves.
+BATCH_FLUSH = 1000  # Summary lines buffered before each write in batch mode
 
 def display_introduction():
     """Display a brief introduction about the 8-tile sliding puzzle game."""
     print("Welcome to the 8-tile sliding puzzle game!")
     print("The objective is to arrange the tiles in sequential order from 1 to 8.")
-    print("You will control the game by sliding tiles into the empty space using your chosen keys for left, right, up, and down movements.\n")
+    print("You will control the game by sliding tiles into the empty space using your chosen keys for left, right, up, and down movements.")
+    print("Type 'hint' at any time to see the next move of an optimal solution.\n")
+
+def parse_movement_keys(text):
+    """Return the movement keys mapping for 4 unique letters, or None if `text` is invalid."""
+    text = ''.join(text.lower().split())  # Remove all whitespaces
+    if len(text) != 4 or not text.isalpha() or len(set(text)) != 4:
+        return None
+    return {'left': text[0], 'right': text[1], 'up': text[2], 'down': text[3]}
 
 def validate_and_get_movement_keys():
     """Prompt for 4 unique letters for movement keys and validate them."""
     # Returns a dictionary mapping of the movement keys to the directions.
     while True:
-        user_input = input("Enter 4 letters for left, right, up, and down movements (e.g., lrud): ").lower().strip()
-        user_input = ''.join(user_input.split())  # Remove all whitespaces
-        if len(user_input) != 4 or not user_input.isalpha() or len(set(user_input)) != 4:
+        user_input = input("Enter 4 letters for left, right, up, and down movements (e.g., lrud): ")
+        movement_keys = parse_movement_keys(user_input)
+        if movement_keys is None:
             print("Invalid input. Please enter 4 unique letters without repetition or non-letter characters.")
             continue
-        break
-
-    return {'left': user_input[0], 'right': user_input[1], 'up': user_input[2], 'down': user_input[3]}
+        return movement_keys
 
 def is_solvable(puzzle):
     """Check if the puzzle configuration is solvable."""
-    inversion_count = 0
-    flat_puzzle = [tile for row in puzzle for tile in row if tile != 0]
-    for i in range(len(flat_puzzle)):
-        for j in range(i + 1, len(flat_puzzle)):
-            if flat_puzzle[i] > flat_puzzle[j]:
-                inversion_count += 1
-    return inversion_count % 2 == 0
-
-def generate_solvable_puzzle():
-    """Generate a solvable puzzle configuration."""
+    # Every solvable 3x3 board has an entry in the distance table.
+    return optimal_distance(puzzle) is not None
+
+def get_difficulty():
+    """Prompt for the optimal number of moves of the puzzle, or none for a random one."""
     while True:
-        puzzle = random.sample(range(9), 9)  # Generate a shuffled list of numbers 0-8
-        puzzle = [puzzle[i:i+3] for i in range(0, 9, 3)]  # Convert the flat list to a 3x3 list
-        if is_solvable(puzzle):
-            return puzzle
+        user_input = input(f"Enter a difficulty as the optimal number of moves (0-{MAX_DIFFICULTY}), "
+                           "or press Enter for a random puzzle: ").strip()
+        if not user_input:
+            return None
+        if user_input.isdigit() and int(user_input) <= MAX_DIFFICULTY:
+            return int(user_input)
+        print(f"Invalid input. Please enter a number from 0 to {MAX_DIFFICULTY}.")
+
+def generate_solvable_puzzle(distance=None):
+    """Generate a solvable puzzle configuration, optionally `distance` moves from solved."""
+    return PuzzleBoard.from_puzzle(puzzle_generator.generate_puzzle(3, distance))
         
 def print_puzzle(puzzle):
     """Print the current puzzle state."""
@@ -45,6 +65,8 @@ def print_puzzle(puzzle):
         
 def find_empty_space(puzzle):
     """Find the empty space in the puzzle."""
+    if isinstance(puzzle, (PackedState, PuzzleBoard)):
+        return puzzle.empty_position
     for i, row in enumerate(puzzle):
         for j, tile in enumerate(row):
             if tile == 0:
@@ -54,6 +76,11 @@ def find_empty_space(puzzle):
 def move_tile(puzzle, direction, movement_keys):
     """Move a tile in the specified direction."""
     # Returns True if the move was made, False otherwise.
+    if isinstance(puzzle, (PackedState, PuzzleBoard)):
+        for name, key in movement_keys.items():
+            if key == direction:
+                return puzzle.move(name)
+        return False
     empty_i, empty_j = find_empty_space(puzzle)
     target_i, target_j = empty_i, empty_j  # Initialize target position with the current empty space position.
 
@@ -74,6 +101,8 @@ def move_tile(puzzle, direction, movement_keys):
 
 def get_valid_moves(puzzle, movement_keys):
     """Describe valid moves based on the current state."""
+    if isinstance(puzzle, (PackedState, PuzzleBoard)):
+        return ', '.join(f"{move}-{movement_keys[move]}" for move in puzzle.valid_moves())
     empty_i, empty_j = find_empty_space(puzzle)
     moves = []
     if empty_j < 2: moves.append(f"left-{movement_keys['left']}")
@@ -84,35 +113,155 @@ def get_valid_moves(puzzle, movement_keys):
 
 def is_solved(puzzle):
     """Check if the puzzle is solved."""
+    if isinstance(puzzle, (PackedState, PuzzleBoard)):
+        return puzzle.is_solved()
     target = list(range(1, 9)) + [0]  # The target sequence for a solved puzzle.
     flat_puzzle = [tile for row in puzzle for tile in row]
     return flat_puzzle == target
 
-def main():
+def show_hint(puzzle, movement_keys, cache):
+    """Print the next move of an optimal solution and the moves left."""
+    moves = cache.solve(puzzle, optimal_solution)
+    if not moves:
+        print("The puzzle is already solved.")
+        return
+    direction = moves[0]
+    print(f"Hint: {direction}-{movement_keys[direction]} ({len(moves)} moves left with optimal play)")
+
+def play_game(cache_path=None, log_path=None):
+    """
+    Play one interactive game.
+
+    Hint solutions are kept in the sqlite file `cache_path` and the solved
+    game is appended to the move log at `log_path`, when given.
+    """
     display_introduction()
     movement_keys = validate_and_get_movement_keys()
-    puzzle = generate_solvable_puzzle()
+    puzzle = generate_solvable_puzzle(get_difficulty())
+    optimal_moves = optimal_distance(puzzle)
+    cache = hint_cache.TranspositionCache(path=cache_path)
+    log = move_log.MoveLog(puzzle) if log_path else None
     move_count = 0
 
     while not is_solved(puzzle):
         print_puzzle(puzzle)
         print(f"Enter your move ({get_valid_moves(puzzle, movement_keys)})> ", end='')
         move = input().lower().strip()
+        if move == 'hint':
+            show_hint(puzzle, movement_keys, cache)
+            continue
         if move not in movement_keys.values():
             print("Invalid move. Please enter a valid move key.")
             continue
         if not move_tile(puzzle, move, movement_keys):
             print("Move not possible. Try a different direction.")
             continue
+        if log is not None:
+            log.record(next(name for name, key in movement_keys.items() if key == move))
         move_count += 1
 
     print_puzzle(puzzle)
     print(f"Congratulations! You've solved the puzzle in {move_count} moves.")
+    print(f"The optimal solution was {optimal_moves} moves.")
+    cache.close()
+    if log is not None:
+        log.save(log_path, reported=move_count)
+
+def play_batch_game(line, distance=None, log_path=None):
+    """
+    Play one game described by a batch input line and return its summary line.
+
+    The line holds the 4 movement keys, the seed of the puzzle and the keys
+    pressed, e.g. "wasd 42 swwa". Keys that are not movement keys or moves
+    that are not possible are counted as rejected, as the interactive game
+    would refuse them. Solved games are appended to the move log at
+    `log_path` when given.
+    """
+    fields = line.split(None, 2)
+    if len(fields) < 2 or not fields[1].lstrip('-').isdigit():
+        return f"invalid line: {line.strip()!r}"
+    movement_keys = parse_movement_keys(fields[0])
+    if movement_keys is None:
+        return f"invalid keys: {fields[0]!r}"
+    seed = int(fields[1])
+    presses = ''.join(fields[2].lower().split()) if len(fields) > 2 else ''
 
-    if input("Play again? (y/n): ").lower().startswith('y'):
-        main()
+    puzzle = puzzle_generator.generate_puzzle(3, distance, random.Random(seed))
+    optimal_moves = optimal_distance(puzzle)
+    state = PackedState.from_puzzle(puzzle)
+    log = move_log.MoveLog(puzzle) if log_path else None
+    directions = {key: name for name, key in movement_keys.items()}
+    move_count = rejected = 0
+    for key in presses:
+        if state.is_solved():
+            break
+        direction = directions.get(key)
+        if direction is None or not state.move(direction):
+            rejected += 1
+            continue
+        if log is not None:
+            log.record(direction)
+        move_count += 1
+
+    if state.is_solved():
+        if log is not None:
+            log.save(log_path, reported=move_count)
+        result = f"solved in {move_count} moves"
     else:
-        print("Thank you for playing. Goodbye!")
+        result = f"not solved after {move_count} moves"
+    return f"seed {seed}: {result}, {rejected} rejected, optimal {optimal_moves}"
+
+def run_batch(source, output, distance=None, log_path=None):
+    """
+    Play every game of `source`, one per line, writing one summary line per game.
+
+    Games are played in a loop and the summaries are written in chunks of
+    BATCH_FLUSH lines, so stack and memory stay constant however many games
+    are played.
+
+    Returns:
+        int: the number of games played.
+    """
+    buffer = []
+    games = 0
+    for line in source:
+        if not line.strip() or line.startswith('#'):
+            continue
+        games += 1
+        buffer.append(f"game {games}: {play_batch_game(line, distance, log_path)}\n")
+        if len(buffer) >= BATCH_FLUSH:
+            output.write(''.join(buffer))
+            buffer.clear()
+    output.write(''.join(buffer))
+    output.flush()
+    return games
+
+def main():
+    parser = argparse.ArgumentParser(description="The 8-tile sliding puzzle game.")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help="play games non-interactively from FILE ('-' or nothing for stdin); "
+                             "each line holds the 4 movement keys, a seed and the keys pressed")
+    parser.add_argument('--difficulty', type=int, choices=range(MAX_DIFFICULTY + 1), metavar='MOVES',
+                        help="optimal number of moves of the batch puzzles (default: random)")
+    parser.add_argument('--log', metavar='FILE', help="append solved games to this move log")
+    parser.add_argument('--hint-cache', metavar='FILE',
+                        help="keep hint solutions in this sqlite file across games (default: memory only)")
+    args = parser.parse_args()
+
+    if args.batch is not None:
+        source = sys.stdin if args.batch == '-' else open(args.batch)
+        try:
+            run_batch(source, sys.stdout, args.difficulty, args.log)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        return
+
+    while True:
+        play_game(args.hint_cache, args.log)
+        if not input("Play again? (y/n): ").lower().startswith('y'):
+            break
+    print("Thank you for playing. Goodbye!")
 
 if __name__ == "__main__":
     main()
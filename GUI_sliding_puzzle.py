@@ -1,68 +1,62 @@
+import argparse
+import time
 import turtle
-import random
+
+import hint_cache
+import move_log
+import puzzle_generator
+import puzzle_solver
+from puzzle_board import PuzzleBoard
+from anytime_solver import FIRST_HINT_BUDGET, HintSearch, LatencyRecorder
 
 # Global Variables
 puzzle_size = 0  # This will be set based on user input
-puzzle = []
-tiles = []
-tiles_num = []
-puzzle_solved = False  # Track if the puzzle is solved
-empty_position = (0, 0)
+board = None  # PuzzleBoard holding the game state
+tiles = []  # Pool of tile turtles, indexed by tile number (None for the empty space)
+tiles_num = []  # Pool of number turtles, indexed like tiles
+hint_search = None  # The running anytime search, if any
+hinted_tile = None  # The tile highlighted by the current hint
+hint_latency = LatencyRecorder()  # Time to the first hint of each request
+solution_cache = None  # TranspositionCache shared by all hint requests
+animations = {}  # tile number -> (tile, start x, start y, end x, end y, start time)
+frame_scheduled = False  # Whether an ontimer frame is pending
+click_latency = LatencyRecorder()  # Time from a click to the updated model
+session_log = None  # MoveLog of the current game, if it is logged
+session_log_path = None  # Move log file the solved game is appended to
 
 #Constants
 EMPTY_SPACE = 0
 tile_size = 80
+# Upper bound offered for each puzzle size. Exact 4x4 boards are searched for
+# on the Tk thread and can take seconds past 35 moves; 5x5 ones are walks.
+MAX_DIFFICULTY = {3: 31, 4: 35, 5: 100}
+HINT_KEY = 'h'
+HINT_COLOR = 'gold'
+HINT_POLL_INTERVAL = 10  # milliseconds between two looks at the hint search
+FRAME_INTERVAL = 16  # milliseconds between two animation frames
+SLIDE_TIME = 0.12  # seconds a tile takes to slide into the empty space
+# Direction of a move, by the offset from the empty space to the moved tile
+MOVE_BY_OFFSET = {offset: move for move, offset in puzzle_solver.BLANK_OFFSETS.items()}
 
-def generate_solvable_puzzle():
-    """Generate a solvable puzzle configuration."""
-    global puzzle
-    while True:
-        flat_puzzle = random.sample(range(puzzle_size ** 2), puzzle_size ** 2)
-        puzzle = [flat_puzzle[i * puzzle_size:(i + 1) * puzzle_size] \
-            for i in range(puzzle_size)]
-        if is_solvable(puzzle):
-            return puzzle
+def generate_solvable_puzzle(distance=None):
+    """Generate a solvable puzzle configuration, optionally `distance` moves from solved."""
+    global board
+    board = PuzzleBoard.from_puzzle(puzzle_generator.generate_puzzle(puzzle_size, distance))
+    return board
 
 def is_solvable(puzzle):
     """Determine if a puzzle is solvable."""
-    inversion_count = 0
     flat_puzzle = [num for row in puzzle for num in row]
-    blank_row = 0  # The row where the blank tile (0) is found, counting from the bottom
-
-    # Find the row position of the blank space from the bottom
-    for i in range(len(puzzle)):
-        if EMPTY_SPACE in puzzle[i]:
-            # Assuming bottom row is 1, adjust accordingly
-            blank_row = len(puzzle) - i
-            break
-
-    # Compute inversions for all numbers except the blank
-    for i in range(len(flat_puzzle)):
-        for j in range(i + 1, len(flat_puzzle)):
-            if flat_puzzle[i] != EMPTY_SPACE and flat_puzzle[j] != EMPTY_SPACE and flat_puzzle[i] > flat_puzzle[j]:
-                inversion_count += 1
-
-    # For odd-size grids, solvability is determined by whether the inversion count is even
-    if len(puzzle) % 2 != 0:
-        return inversion_count % 2 == 0
-    else:
-        # For even-size grids, add the inversion count and the blank's row. If the sum is even, the puzzle is solvable
-        return (inversion_count + blank_row) % 2 == 0
+    return puzzle_solver.is_solvable(flat_puzzle, len(puzzle))
 
 
 def find_empty_space():
     """Find the row and column of the empty space."""
-    for i, row in enumerate(puzzle):
-        for j, val in enumerate(row):
-            if val == EMPTY_SPACE:
-                return i, j
+    return board.empty_position
             
 def is_solved():
     """Check if the puzzle is solved."""
-    global puzzle_solved, puzzle 
-    target = list(range(1, puzzle_size ** 2)) + [EMPTY_SPACE]
-    if [tile for row in puzzle for tile in row] == target:
-        puzzle_solved = True  # Set puzzle_solved to True
+    return board.is_solved()
 
 class NumberedTile(turtle.Turtle):
     """A turtle graphics class for creating tiles with number attributes."""
@@ -138,39 +132,60 @@ def get_screen_coordinates(row, col, tile_size=80, spacing=10):
     return x, y
 
 
+def get_grid_coordinates(x, y, tile_size=80, spacing=10):
+    """
+    Convert screen coordinates to the grid cell under them.
+
+    Inverse of get_screen_coordinates; returns None when (x, y) is outside
+    the board or on the spacing between two tiles.
+    """
+    sz = tile_size + spacing
+    start_x, start_y = get_screen_coordinates(0, 0, tile_size, spacing)
+    col = round((x - start_x) / sz)
+    row = round((start_y - y) / sz)
+    if not (0 <= row < puzzle_size and 0 <= col < puzzle_size):
+        return None
+    center_x, center_y = get_screen_coordinates(row, col, tile_size, spacing)
+    if abs(x - center_x) >= tile_size / 2 or abs(y - center_y) >= tile_size / 2:
+        return None
+    return row, col
+
+
 def display_puzzle(puzzle, tile_size=80, tile_color='lavender', num_color='midnightblue'):
     """
     Display all tiles for the puzzle on the screen.
     
     Based on the puzzle grid, calculate the x, y coordinates of the tiles and numbers,
-    draw each tile and number using create_tile and create_number 
+    and move each tile and number there. The turtles are created once by
+    create_tile and create_number and reused by every later repaint.
     
-    Turn off animation for generating tiles 
-    and reopen it after the tile generating for sliding activity.
+    Turn off turtle animation for instant drawing; slides are animated
+    frame by frame by animate_frame instead.
     """
-    global tiles, empty_position, puzzle_size
-    tiles.clear()  # Clear the old tiles list
+    global tiles, tiles_num
+    animations.clear()  # Tiles are put straight on their cells
     turtle.tracer(0, 0)  # Turn off the animation for instant drawing
 
-    # Create and display tiles (squares)
-    for i, row in enumerate(puzzle):
-        for j, number in enumerate(row):
-            if number != EMPTY_SPACE:  # Only create and display non-empty tiles
-                x, y = get_screen_coordinates(i, j, tile_size, spacing=10)
-                tile = create_tile(number, x, y, tile_size, tile_color)
-                tiles.append(tile)
-            else:
-                empty_position = (i, j)
-    turtle.update()  # Update the screen after all drawing commands
-    turtle.tracer(1,10) # Then turn on the animation
+    if len(tiles) != puzzle_size ** 2:
+        # First repaint: fill the pools, one tile and one number per tile number
+        tiles = [None] + [create_tile(number, 0, 0, tile_size, tile_color)
+                          for number in range(1, puzzle_size ** 2)]
+        tiles_num = [None] + [create_number('', 0, 0, tile_size, num_color)
+                              for number in range(1, puzzle_size ** 2)]
 
-    # After all tiles are created, draw numbers on them
     for i, row in enumerate(puzzle):
         for j, number in enumerate(row):
-            if number != EMPTY_SPACE:
+            if number != EMPTY_SPACE:  # Only display non-empty tiles
                 x, y = get_screen_coordinates(i, j, tile_size, spacing=10)
-                num_turtle = create_number(number, x, y, tile_size, num_color)
-                tiles_num.append(num_turtle)
+                tile = tiles[number]
+                tile.color(tile_color)
+                tile.goto(x, y)
+                num_turtle = tiles_num[number]
+                num_turtle.clear()
+                num_turtle.color(num_color)
+                num_turtle.goto(x, y - tile_size / 8)
+                num_turtle.write(number, align="center", font=("Arial", int(tile_size / 5), "bold"))
+    turtle.update()  # Update the screen after all drawing commands
 
     
 def get_tile_index(tile):
@@ -178,52 +193,82 @@ def get_tile_index(tile):
     given a specified tile,
     return the corresponding row and column index in the puzzle grid.
     """
-    global tiles, puzzle
-    for i, row in enumerate(puzzle):
-        for j, number in enumerate(row):
-            if number == tile.number:
-                index = i, j
-    return index
+    return board.tile_position(tile.number)
     
     
+def place_tile(tile, x, y):
+    """Put a tile and its number at (x, y) on the screen."""
+    num = tiles_num[tile.number]
+    tile.goto(x, y)
+    num.clear()
+    num.goto(x, y - tile_size / 8)
+    num.write(tile.number, align="center", font=("Arial", int(tile_size / 5), "bold"))
+
+
 def sliding(tile, x, y):
     """
-    Animate a tile sliding to a new position.
+    Start animating a tile sliding to a new position, without waiting for it.
     Helper function used in sliding_hdlr
     
+    A slide still in progress snaps to its end first, so fast clicks never
+    queue up behind the animation.
+    
     Args: 
     tile: tile to move
     x: x coordinate of the destination
     y: y coordinate of the destination
     
     """
-    global tiles, puzzle, empty_position
-    number = tile.number
-    num = tiles_num[tiles.index(tile)]
-    num.clear()
-    num.goto(x, y - tile_size / 8)
-    tile.speed(3)
-    tile.goto(x, y)
-    num.write(number, align="center", font=("Arial", int(tile_size / 5), "bold"))
+    finish_animations()
+    start_x, start_y = tile.xcor(), tile.ycor()
+    animations[tile.number] = (tile, start_x, start_y, x, y, time.perf_counter())
+    request_frame()
+
+
+def finish_animations():
+    """Snap every slide in progress to its end."""
+    for tile, _, _, end_x, end_y, _ in animations.values():
+        place_tile(tile, end_x, end_y)
+    animations.clear()
+
+
+def request_frame():
+    """Make sure a frame is drawn soon; several requests share one frame."""
+    global frame_scheduled
+    if not frame_scheduled:
+        frame_scheduled = True
+        turtle.ontimer(animate_frame, FRAME_INTERVAL)
+
+
+def animate_frame():
+    """
+    Advance every slide by the time elapsed and redraw the screen once.
+
+    All clicks handled since the previous frame are shown by this single
+    update. Another frame is requested while slides remain.
+    """
+    global frame_scheduled
+    frame_scheduled = False
+    now = time.perf_counter()
+    for number, (tile, start_x, start_y, end_x, end_y, started) in list(animations.items()):
+        progress = min(1.0, (now - started) / SLIDE_TIME)
+        place_tile(tile, start_x + (end_x - start_x) * progress, start_y + (end_y - start_y) * progress)
+        if progress == 1.0:
+            del animations[number]
+    turtle.update()
+    if animations:
+        request_frame()
     
 
-def update_puzzle(tile, empty_row, empty_col):
+def update_puzzle(tile):
     """
-    Update the puzzle array to reflect the moved tile.
+    Update the board model to reflect the moved tile.
     Helper function used in sliding hdler.
     
     Args:
     tile: the moved tile
-    empty_row, empty_col: the grid coordinate of the empty space in puzzle array
     """
-    global tiles, puzzle, empty_position 
-    
-    original_row, original_col = get_tile_index(tile)
-    
-    puzzle[empty_row][empty_col], puzzle[original_row][original_col] = \
-    puzzle[original_row][original_col], EMPTY_SPACE
-    
-    empty_position = (original_row, original_col)
+    board.slide(*get_tile_index(tile))
     
     
 def is_adjacent(tile_row, tile_col):
@@ -231,14 +276,7 @@ def is_adjacent(tile_row, tile_col):
     Check if a tile is adjacent to the empty space.
     Helper function used in sliding hdler.
     """
-    global empty_position
-    
-    empty_row, empty_col = empty_position
-    if (tile_row == empty_row and abs(tile_col - empty_col) == 1) or \
-       (tile_col == empty_col and abs(tile_row - empty_row) == 1):
-        return True
-    else:
-        return False
+    return board.is_adjacent(tile_row, tile_col)
     
     
 def sliding_hdlr(tile):
@@ -246,45 +284,131 @@ def sliding_hdlr(tile):
     Handle the tile sliding action, including checking for puzzle completion.
     Also checks whether this move leads to the puzzle being solved.
     """
-    global empty_position, tiles, puzzle_solved
-    empty_row, empty_col = empty_position
+    empty_row, empty_col = board.empty_position
     if tile:
-        if not puzzle_solved:
+        if not board.is_solved():
             tile_row, tile_col = get_tile_index(tile)
             x, y = get_screen_coordinates(empty_row, empty_col)
             if is_adjacent(tile_row, tile_col):
+                following_hints = hint_search is not None or hinted_tile is not None
+                cancel_hint()  # The board changes, the hint is stale
+                update_puzzle(tile)  # The model changes first, the slide follows
                 sliding(tile, x, y)
-                update_puzzle(tile, empty_row, empty_col)
+                if session_log is not None:
+                    session_log.record(MOVE_BY_OFFSET[tile_row - empty_row, tile_col - empty_col])
+                    if board.is_solved():
+                        session_log.save(session_log_path)
+                if following_hints:
+                    request_hint()  # Usually answered by the cache
     
-    is_solved()
-    if (puzzle_solved):
-        display_puzzle(puzzle, tile_size=80, tile_color = 'red', num_color = 'pink')
+    if is_solved():
+        display_puzzle(board, tile_size=80, tile_color = 'red', num_color = 'pink')
         print("Congratulations! Puzzle solved!")
+        print(f"Click latency: {click_latency.summary()}")
+        if hint_latency.samples:
+            print(f"Hint latency: {hint_latency.summary()}")
+            print(f"Hint cache: {solution_cache.stats()}")
         return
     
         
+def request_hint():
+    """
+    Start an anytime search for the current board without blocking the window.
+
+    Boards seen before, or mirrors of them, are answered by the solution
+    cache. Otherwise the search runs in a worker thread; poll_hint picks up
+    its results through ontimer and highlights the tile to move.
+    """
+    global hint_search
+    if board.is_solved():
+        return
+    cancel_hint()
+    cached = solution_cache.get(board) if solution_cache is not None else None
+    if cached is not None:
+        moves, optimal = cached
+        if moves:
+            show_hint(moves[0])
+        if optimal or not moves:
+            return
+    hint_search = HintSearch(board, recorder=hint_latency).start()
+    search = hint_search
+    turtle.ontimer(lambda: poll_hint(search), HINT_POLL_INTERVAL)
+
+
+def poll_hint(search):
+    """Show the best hint published so far and keep polling while the search runs."""
+    if search is not hint_search:
+        return  # cancelled by a move or replaced by a newer request
+    moves, optimal = search.result()
+    if moves:
+        show_hint(moves[0])
+    if not search.finished:
+        turtle.ontimer(lambda: poll_hint(search), HINT_POLL_INTERVAL)
+        return
+    if moves and solution_cache is not None:
+        solution_cache.put(board, moves, optimal)
+    if search.first_latency is not None and search.first_latency > FIRST_HINT_BUDGET:
+        print(f"First hint took {search.first_latency * 1000:.0f} ms "
+              f"(budget {FIRST_HINT_BUDGET * 1000:.0f} ms)")
+
+
+def show_hint(direction):
+    """Highlight the tile that slides in `direction` into the empty space."""
+    global hinted_tile
+    d_row, d_col = puzzle_solver.BLANK_OFFSETS[direction]
+    empty_row, empty_col = board.empty_position
+    number = board.tile_at(empty_row + d_row, empty_col + d_col)
+    tile = tiles[number]
+    if tile is not hinted_tile:
+        clear_hint()
+        tile.color(HINT_COLOR)
+        hinted_tile = tile
+        request_frame()
+
+
+def clear_hint():
+    """Remove the hint highlight."""
+    global hinted_tile
+    if hinted_tile is not None:
+        hinted_tile.color('lavender')
+        hinted_tile = None
+        request_frame()
+
+
+def cancel_hint():
+    """Stop the running hint search and remove its highlight."""
+    global hint_search
+    if hint_search is not None:
+        hint_search.cancel()
+        hint_search = None
+    clear_hint()
+
+
 def get_clicked_tile(x, y):
     """
     Get the tile object that was clicked by the user.
     Args:
     x, y: x and y coordinate on the screen
     """
-    global tiles, puzzle_size
-    for tile in tiles:
-        if tile.isvisible():
-            x_min, y_min = tile.xcor() - 40, tile.ycor() - 40
-            x_max, y_max = tile.xcor() + 40, tile.ycor() + 40
-            
-            if x_min < x < x_max and y_min < y < y_max:
-                return tile
+    cell = get_grid_coordinates(x, y)
+    if cell is not None:
+        return tiles[board.tile_at(*cell)]  # None on the empty space
 
 def on_mouse_click(x, y):
     """Handle mouse click events on the turtle screen."""
+    started = time.perf_counter()
     tile = get_clicked_tile(x, y)
     sliding_hdlr(tile)
+    click_latency.record(time.perf_counter() - started)
         
 
 if __name__ == "__main__":        
+    parser = argparse.ArgumentParser(description="The sliding puzzle game in a window.")
+    parser.add_argument('--hint-cache', metavar='FILE',
+                        help="keep hint solutions in this sqlite file across games (default: memory only)")
+    parser.add_argument('--log', metavar='FILE', help="append the solved game to this move log")
+    args = parser.parse_args()
+
     s = turtle.Screen()
     s.setup(600,600)
 
@@ -292,12 +416,20 @@ if __name__ == "__main__":
     puzzle_size = turtle.numinput("Puzzle Size", "Enter the size of the game (3-5):",\
         default=3, minval=3, maxval=5)
     puzzle_size = int(puzzle_size)
-    puzzle = generate_solvable_puzzle() 
+    # Difficulty is the number of moves of an optimal solution, 0 for a random board
+    difficulty = turtle.numinput("Difficulty", "Enter the number of moves to solve (0 for random):",\
+        default=0, minval=0, maxval=MAX_DIFFICULTY[puzzle_size])
+    board = generate_solvable_puzzle(int(difficulty) if difficulty else None)
+    solution_cache = hint_cache.TranspositionCache(path=args.hint_cache)
+    session_log_path = args.log
+    session_log = move_log.MoveLog(board) if args.log else None
     
     # Display the puzzle after initializing
-    display_puzzle(puzzle)
+    display_puzzle(board)
     
     # Enable event listening in the Turtle graphics window to respond to mouse clicks
     turtle.listen()
     turtle.onscreenclick(on_mouse_click) # Call on_mouse_click function when clicking
+    turtle.onkey(request_hint, HINT_KEY) # Press 'h' for a hint
+    print(f"Press '{HINT_KEY}' in the puzzle window for a hint.")
     turtle.Screen().mainloop()
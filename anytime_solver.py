@@ -0,0 +1,218 @@
+"""
+Anytime hint solver that runs off the GUI thread.
+
+Weighted A* (f = g + w * h) finds a solution quickly when w is large and a
+better one as w shrinks. HintSearch runs a series of weighted A* passes
+with decreasing weights in a worker thread, each pass pruned by the best
+solution found so far, and publishes every improvement. The last pass uses
+w = 1, so once it finishes the published solution is optimal.
+
+For boards of 4x4 and up the constructive solver of large_puzzle_solver.py
+publishes a (long) solution within milliseconds before the first pass, so
+a hint is available well inside the latency budget; should it fail, the
+passes still run, only without its bound.
+
+The caller polls result() (the GUI does it with ontimer) and cancels the
+search as soon as the board changes. LatencyRecorder keeps the time to the
+first hint of each search so the budget can be tuned from percentiles.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+
+from large_puzzle_solver import MIN_CONSTRUCTIVE_SIZE, solve_large
+from puzzle_solver import (EMPTY_SPACE, get_tables, goal_state, is_solvable,
+                           linear_conflicts, manhattan_distance)
+
+WEIGHTS = (8, 4, 2, 1.5, 1.2, 1)
+FIRST_HINT_BUDGET = 0.05  # seconds
+SEARCH_TIME_LIMIT = 10  # seconds before a search keeps its best solution and stops
+# How many expansions pass between two checks for cancellation.
+CANCEL_CHECK_INTERVAL = 256
+
+
+def estimate(tiles, size):
+    """Manhattan distance plus linear conflicts of a flat board."""
+    return manhattan_distance(tiles, size) + linear_conflicts(tiles, size)
+
+
+def weighted_astar(tiles, size, weight, bound=None, cancelled=None, deadline=None):
+    """
+    One weighted A* pass.
+
+    Args:
+        tiles: flat board
+        size: width of the board
+        weight: inflation factor of the heuristic
+        bound: only return solutions shorter than this many moves
+        cancelled: threading.Event that stops the search when set
+        deadline: optional time.perf_counter() value after which to give up
+
+    Returns:
+        list or None: the moves found, or None if no solution shorter than
+        `bound` exists or the search was cancelled or ran out of time.
+    """
+    neighbors = get_tables(size)[0]
+    goal = goal_state(size)
+    start = tuple(tiles)
+    bound = float('inf') if bound is None else bound
+    h = estimate(start, size)
+    if h >= bound:
+        return None
+    parents = {start: None}
+    best_g = {start: 0}
+    heap = [(weight * h, 0, h, start, start.index(EMPTY_SPACE))]
+    expanded = 0
+    while heap:
+        _, g, h, state, blank = heapq.heappop(heap)
+        if g > best_g[state]:
+            continue
+        if state == goal:
+            moves = []
+            while parents[state] is not None:
+                state, move = parents[state]
+                moves.append(move)
+            moves.reverse()
+            return moves
+        expanded += 1
+        if expanded % CANCEL_CHECK_INTERVAL == 0:
+            if (cancelled is not None and cancelled.is_set()) or \
+                    (deadline is not None and time.perf_counter() > deadline):
+                return None
+        for target, direction in neighbors[blank]:
+            tile = state[target]
+            child = list(state)
+            child[blank], child[target] = tile, EMPTY_SPACE
+            child = tuple(child)
+            child_g = g + 1
+            if child_g >= best_g.get(child, bound):
+                continue
+            child_h = estimate(child, size)
+            # Admissible h: this branch cannot beat the current bound.
+            if child_g + child_h >= bound:
+                continue
+            best_g[child] = child_g
+            parents[child] = (state, direction)
+            heapq.heappush(heap, (child_g + weight * child_h, child_g, child_h, child, target))
+    return None
+
+
+class LatencyRecorder:
+    """Bounded record of latencies with percentile summaries."""
+
+    def __init__(self, capacity=1000):
+        self.samples = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percent):
+        """Latency below which `percent` of the samples fall (nearest rank)."""
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def summary(self, percents=(50, 90, 99)):
+        """One-line report such as 'p50 3.1ms  p90 12.0ms  p99 40.2ms (n=20)'."""
+        if not self.samples:
+            return "no samples"
+        parts = [f"p{percent} {self.percentile(percent) * 1000:.1f}ms" for percent in percents]
+        return '  '.join(parts) + f" (n={len(self.samples)})"
+
+
+class HintSearch:
+    """
+    Anytime search for one board, running in a daemon thread.
+
+    Attributes:
+        first_latency: seconds from start() to the first published solution
+    """
+
+    def __init__(self, puzzle, weights=WEIGHTS, recorder=None, time_limit=SEARCH_TIME_LIMIT):
+        self.size = len(puzzle)
+        self.tiles = [tile for row in puzzle for tile in row]
+        self.weights = weights
+        self.time_limit = time_limit
+        self.recorder = recorder
+        self.first_latency = None
+        self._moves = None
+        self._optimal = False
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop the search; the worker exits at its next check."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def result(self):
+        """
+        Best solution published so far.
+
+        Returns:
+            tuple: (moves, optimal); moves is None before the first solution.
+        """
+        with self._lock:
+            return self._moves, self._optimal
+
+    def _publish(self, moves, optimal):
+        with self._lock:
+            self._moves, self._optimal = moves, optimal
+        if self.first_latency is None:
+            self.first_latency = self.elapsed()
+            if self.recorder is not None:
+                self.recorder.record(self.first_latency)
+
+    def _run(self):
+        try:
+            if not is_solvable(self.tiles, self.size):
+                return
+            best = None
+            if self.size >= MIN_CONSTRUCTIVE_SIZE:
+                try:
+                    best = solve_large(self.tiles, self.size)
+                except RuntimeError:
+                    pass  # the weighted A* passes below need no first solution
+                else:
+                    self._publish(best, False)
+            deadline = self._started + self.time_limit
+            for weight in self.weights:
+                moves = weighted_astar(self.tiles, self.size, weight,
+                                       len(best) if best is not None else None,
+                                       self._cancelled, deadline)
+                if self._cancelled.is_set() or time.perf_counter() > deadline:
+                    return
+                if moves is not None:
+                    best = moves
+                if weight == 1:
+                    # Nothing shorter exists: the best solution is optimal.
+                    self._publish(best, True)
+                elif moves is not None:
+                    self._publish(best, False)
+        finally:
+            self._finished.set()
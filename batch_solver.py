@@ -0,0 +1,179 @@
+"""
+Solve a stream of sliding puzzles in parallel.
+
+Reads one board per line in JSON, either a list-of-lists board as used by
+CLI_sliding_puzzle.py or an object {"id": ..., "puzzle": [[...], ...]}, and
+writes one JSON result per line as soon as each board is finished:
+
+    {"line": 3, "id": "a", "status": "solved", "moves": ["up", ...],
+     "length": 22, "nodes": 1840, "time": 0.0123}
+
+status is one of "solved", "timeout", "unsolvable", "invalid" or "error"
+(the heuristic could not be loaded, e.g. pattern databases missing or
+corrupt). Results come out in completion order; "line" tells which input
+they belong to.
+
+Boards are spread over a process pool with a bounded number in flight, so
+memory stays flat however long the input is. Each board gets its own time
+limit inside the worker.
+
+Usage:
+    python batch_solver.py boards.jsonl -o results.jsonl --workers 8 --time-limit 30
+    cat boards.jsonl | python batch_solver.py --heuristic pdb
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from pattern_database import make_heuristic
+from puzzle_solver import SearchTimeout, flatten, ida_star, is_solvable
+
+# Heuristic settings and cached heuristic objects of a worker process.
+_heuristic_kind = 'manhattan'
+_heuristics = {}
+
+
+def _init_worker(heuristic_kind):
+    global _heuristic_kind
+    _heuristic_kind = heuristic_kind
+
+
+def _get_heuristic(size):
+    """Build a heuristic once per worker and board size."""
+    if size not in _heuristics:
+        kind = _heuristic_kind
+        if kind == 'pdb' and size not in (4, 5):
+            kind = 'manhattan'
+        _heuristics[size] = make_heuristic(size, kind)
+    return _heuristics[size]
+
+
+def _parse(line):
+    """Return (id, puzzle) from one input line, raising ValueError if malformed."""
+    record = json.loads(line)
+    board_id = None
+    if isinstance(record, dict):
+        board_id = record.get('id')
+        record = record.get('puzzle')
+    size = len(record) if isinstance(record, list) else 0
+    if size < 2 or any(not isinstance(row, list) or len(row) != size for row in record):
+        raise ValueError("the puzzle must be a square list of lists")
+    tiles = flatten(record)
+    # JSON true, false and 1.0 compare equal to tiles but are not ints.
+    if any(type(tile) is not int for tile in tiles) or sorted(tiles) != list(range(size * size)):
+        raise ValueError(f"the puzzle must hold the numbers 0 to {size * size - 1}")
+    return board_id, record
+
+
+def solve_line(number, line, time_limit):
+    """
+    Solve the board on one input line; runs in a worker process.
+
+    Returns:
+        str: the JSON result line, without the newline.
+    """
+    result = {'line': number}
+    started = time.perf_counter()
+    try:
+        result['id'], puzzle = _parse(line)
+    except ValueError as error:
+        result.update(status='invalid', error=str(error))
+        return json.dumps(result)
+
+    size = len(puzzle)
+    tiles = flatten(puzzle)
+    if not is_solvable(tiles, size):
+        result['status'] = 'unsolvable'
+        return json.dumps(result)
+    try:
+        heuristic = _get_heuristic(size)
+    except (OSError, ValueError) as error:  # missing or corrupt pattern databases
+        result.update(status='error', error=str(error))
+        return json.dumps(result)
+    deadline = started + time_limit if time_limit else None
+    try:
+        moves, nodes = ida_star(tiles, size, heuristic, deadline)
+        result.update(status='solved', moves=moves, length=len(moves), nodes=nodes)
+    except SearchTimeout as timeout:
+        result.update(status='timeout', nodes=timeout.nodes)
+    result['time'] = round(time.perf_counter() - started, 6)
+    return json.dumps(result)
+
+
+def run(lines, output, workers=None, time_limit=None, heuristic='manhattan', in_flight=None):
+    """
+    Solve every board of `lines` and stream the results to `output`.
+
+    Args:
+        lines: iterable of input lines
+        output: writable text file
+        workers: number of worker processes, defaults to the CPU count
+        time_limit: seconds allowed per board, None for no limit
+        heuristic: 'manhattan' or 'pdb'
+        in_flight: most boards submitted but not yet written, defaults to
+            four per worker
+
+    Returns:
+        dict: counts of each status.
+    """
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or 4 * workers
+    counts = {}
+
+    def drain(futures):
+        for future in futures:
+            line = future.result()
+            output.write(line + '\n')
+            status = json.loads(line)['status']
+            counts[status] = counts.get(status, 0) + 1
+        output.flush()
+
+    pending = set()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(heuristic,)) as pool:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            if len(pending) >= in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                drain(done)
+            pending.add(pool.submit(solve_line, number, line, time_limit))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            drain(done)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve sliding puzzles from a JSONL stream.")
+    parser.add_argument('input', nargs='?', default='-', help="input file, '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--time-limit', type=float, default=None, help="seconds allowed per board")
+    parser.add_argument('--heuristic', choices=('manhattan', 'pdb'), default='manhattan')
+    parser.add_argument('--in-flight', type=int, default=None,
+                        help="boards queued at most (default: 4 per worker)")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    started = time.perf_counter()
+    try:
+        counts = run(source, target, args.workers, args.time_limit, args.heuristic, args.in_flight)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{total} boards in {elapsed:.2f}s ({total / elapsed:.1f}/s): {summary or 'none'}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark: time to generate a board at each target distance.
+
+3x3 boards are sampled from the distance-bucketed table (bucketing is done
+once, before timing), 4x4 boards come from guided walks checked by IDA*,
+and 5x5 boards from guided walks alone.
+
+Run from the repository root:
+    python -m benchmarks.bench_difficulty
+"""
+
+import random
+import time
+
+from eight_puzzle_table import boards_at_distance
+from puzzle_generator import generate_puzzle
+
+DISTANCES = {
+    3: range(0, 32),
+    4: range(5, 51, 5),
+    5: range(10, 101, 10),
+}
+REPEATS = {3: 200, 4: 5, 5: 50}
+
+
+def main():
+    rng = random.Random(0)
+    boards_at_distance(0)  # build the buckets outside the timed loop
+    for size, distances in DISTANCES.items():
+        print(f"{size}x{size}")
+        for distance in distances:
+            start = time.perf_counter()
+            for _ in range(REPEATS[size]):
+                generate_puzzle(size, distance, rng)
+            elapsed = (time.perf_counter() - start) / REPEATS[size]
+            print(f"  distance {distance:3d}: {elapsed * 1000:10.3f} ms per board")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Headless benchmark: click handling of GUI_sliding_puzzle.py over 10k moves.
+
+The turtle module is replaced by benchmarks.stub_turtle, so only the
+game's own work is timed: hit testing, the model update and moving the
+tile and number turtles. Every window of moves also repaints the whole
+board, as happens on solve, to show that the turtle pool does not grow.
+
+Run from the repository root:
+    python -m benchmarks.bench_gui_clicks
+"""
+
+import random
+import time
+
+from benchmarks import stub_turtle
+
+stub_turtle.install()
+
+import GUI_sliding_puzzle as gui  # noqa: E402  (needs the stub installed first)
+from puzzle_solver import BLANK_OFFSETS  # noqa: E402
+
+MOVES = 10_000
+WINDOW = 1_000
+SIZE = 5
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(percent / 100 * len(ordered)))]
+
+
+def main():
+    rng = random.Random(0)
+    gui.puzzle_size = SIZE
+    gui.generate_solvable_puzzle()
+    gui.display_puzzle(gui.board)
+    print(f"{SIZE}x{SIZE} board, {MOVES} clicks")
+    print(f"{'moves':>6} {'p50 us':>8} {'p99 us':>8} {'turtles':>8}")
+    latencies = []
+    for move in range(1, MOVES + 1):
+        empty_row, empty_col = gui.board.empty_position
+        direction = rng.choice(gui.board.valid_moves())
+        d_row, d_col = BLANK_OFFSETS[direction]
+        x, y = gui.get_screen_coordinates(empty_row + d_row, empty_col + d_col)
+        start = time.perf_counter()
+        gui.on_mouse_click(x, y)
+        latencies.append(time.perf_counter() - start)
+        if move % WINDOW == 0:
+            gui.display_puzzle(gui.board)
+            print(f"{move:>6} {percentile(latencies, 50) * 1e6:>8.1f} "
+                  f"{percentile(latencies, 99) * 1e6:>8.1f} {stub_turtle.created:>8}")
+            latencies.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark: runtime and solution length of the constructive solver against
+board size, before and after removing redundant moves.
+
+Run from the repository root:
+    python -m benchmarks.bench_large_solver
+"""
+
+import random
+import time
+
+from large_puzzle_solver import solve_large
+from puzzle_generator import generate_solvable_tiles
+
+SIZES = (6, 10, 15, 20, 30, 40, 50)
+BOARDS = 3
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>5} {'raw ms':>10} {'raw moves':>11} {'total ms':>10} {'moves':>10} {'saved':>7}")
+    for size in SIZES:
+        raw_time = total_time = raw_moves = moves = 0
+        for _ in range(BOARDS):
+            tiles = generate_solvable_tiles(size, rng)
+            start = time.perf_counter()
+            raw_moves += len(solve_large(tiles, size, optimize=False))
+            raw_time += time.perf_counter() - start
+            start = time.perf_counter()
+            moves += len(solve_large(tiles, size))
+            total_time += time.perf_counter() - start
+        print(f"{size:>5} {raw_time / BOARDS * 1000:10.1f} {raw_moves // BOARDS:11d} "
+              f"{total_time / BOARDS * 1000:10.1f} {moves // BOARDS:10d} "
+              f"{(raw_moves - moves) / raw_moves:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
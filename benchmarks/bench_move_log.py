@@ -0,0 +1,55 @@
+"""
+Benchmark: replay verification speed of move logs, in moves per second.
+
+Each log starts from the end of a random walk away from the solved board
+and records the walk undone, so every record should verify as 'ok'. The
+logs are written to memory and then streamed through move_log.verify.
+
+Run from the repository root:
+    python -m benchmarks.bench_move_log
+"""
+
+import io
+import random
+import time
+
+import move_log
+from puzzle_board import PuzzleBoard
+from puzzle_solver import OPPOSITE_MOVE
+
+LOGS = 4096
+UNIQUE_LOGS = 512  # generated with Python moves, then repeated up to LOGS
+MOVES = 1000
+
+
+def make_logs(size, logs, moves, seed=0):
+    """Return the bytes of `logs` solved records of `moves` moves each."""
+    rng = random.Random(seed)
+    out = io.BytesIO()
+    for _ in range(logs):
+        board = PuzzleBoard.solved(size)
+        walk = []
+        for _ in range(moves):
+            direction = rng.choice(board.valid_moves())
+            board.move(direction)
+            walk.append(direction)
+        log = move_log.MoveLog(board)
+        for direction in reversed(walk):
+            log.record(OPPOSITE_MOVE[direction])
+        out.write(log.to_bytes())
+    return out.getvalue()
+
+
+def main():
+    for size in (3, 4, 5):
+        data = make_logs(size, UNIQUE_LOGS, MOVES, seed=size) * (LOGS // UNIQUE_LOGS)
+        start = time.perf_counter()
+        results = list(move_log.verify(move_log.read_logs(io.BytesIO(data))))
+        elapsed = time.perf_counter() - start
+        ok = sum(status == 'ok' for *_, status in results)
+        print(f"{size}x{size}: {len(results)} logs, {LOGS * MOVES:,} moves, "
+              f"{len(data) / LOGS:.0f} bytes/log, {LOGS * MOVES / elapsed:14,.0f} moves/s, {ok} ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: boards per second of the NumPy batch engine against the
+per-board functions.
+
+The per-board side runs is_solved from CLI_sliding_puzzle.py and
+is_solvable/manhattan_distance from puzzle_solver.py on list boards; the
+batch side runs puzzle_batch.py on one (batch, 9) array.
+
+Run from the repository root:
+    python -m benchmarks.bench_puzzle_batch [batch]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import CLI_sliding_puzzle as cli
+import puzzle_batch
+import puzzle_solver
+
+SIZE = 3
+PER_BOARD = 20_000
+
+
+def rate(count, function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    batch = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    boards = puzzle_batch.random_boards(batch, SIZE, rng)
+    puzzles = puzzle_batch.to_puzzles(boards[:PER_BOARD], SIZE)
+    flats = [puzzle_solver.flatten(puzzle) for puzzle in puzzles]
+    check = puzzle_batch.is_solvable(boards[:PER_BOARD], SIZE)
+    assert check.tolist() == [puzzle_solver.is_solvable(tiles, SIZE) for tiles in flats]
+
+    def per_board_solvable():
+        for tiles in flats:
+            puzzle_solver.is_solvable(tiles, SIZE)
+
+    def per_board_solved():
+        for puzzle in puzzles:
+            cli.is_solved(puzzle)
+
+    def per_board_manhattan():
+        for tiles in flats:
+            puzzle_solver.manhattan_distance(tiles, SIZE)
+
+    rows = [
+        ("random_boards", None, rate(batch, puzzle_batch.random_boards, batch, SIZE, rng)),
+        ("is_solvable", rate(PER_BOARD, per_board_solvable),
+         rate(batch, puzzle_batch.is_solvable, boards, SIZE)),
+        ("is_solved", rate(PER_BOARD, per_board_solved),
+         rate(batch, puzzle_batch.is_solved, boards, SIZE)),
+        ("manhattan", rate(PER_BOARD, per_board_manhattan),
+         rate(batch, puzzle_batch.manhattan, boards, SIZE)),
+        ("misplaced", None, rate(batch, puzzle_batch.misplaced, boards, SIZE)),
+        ("scramble (1 step)", None,
+         rate(batch * 20, puzzle_batch.scramble, boards, SIZE, 20, rng)),
+    ]
+    print(f"{batch:,} boards of {SIZE}x{SIZE}")
+    print(f"{'operation':<20} {'per board':>14} {'batch':>14}   (boards/s)")
+    for name, single, batched in rows:
+        single = f"{single:14,.0f}" if single else f"{'-':>14}"
+        print(f"{name:<20} {single} {batched:14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
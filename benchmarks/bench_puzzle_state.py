@@ -0,0 +1,65 @@
+"""
+Microbenchmark: moves per second of PackedState against the list boards.
+
+Both sides replay the same random walk through the functions the game
+uses: move_tile/is_solved from CLI_sliding_puzzle.py on a list-of-lists
+board, and PackedState.move/is_solved on the packed board.
+
+Run from the repository root:
+    python -m benchmarks.bench_puzzle_state
+"""
+
+import random
+import time
+
+import CLI_sliding_puzzle as cli
+from puzzle_state import PackedState
+
+KEYS = {'left': 'a', 'right': 'd', 'up': 'w', 'down': 's'}
+MOVES = 200_000
+
+
+def random_walk(size, count, seed=0):
+    """Return `count` legal directions starting from the solved board."""
+    rng = random.Random(seed)
+    state = PackedState.solved(size)
+    walk = []
+    for _ in range(count):
+        direction = rng.choice(state.valid_moves())
+        state.move(direction)
+        walk.append(direction)
+    return walk
+
+
+def bench_lists(walk):
+    puzzle = PackedState.solved(3).to_puzzle()
+    keys = [KEYS[direction] for direction in walk]
+    start = time.perf_counter()
+    for key in keys:
+        cli.move_tile(puzzle, key, KEYS)
+        cli.is_solved(puzzle)
+    return len(walk) / (time.perf_counter() - start)
+
+
+def bench_packed(walk, size):
+    state = PackedState.solved(size)
+    move, is_solved = state.move, state.is_solved
+    start = time.perf_counter()
+    for direction in walk:
+        move(direction)
+        is_solved()
+    return len(walk) / (time.perf_counter() - start)
+
+
+def main():
+    walk = random_walk(3, MOVES)
+    lists = bench_lists(walk)
+    print(f"3x3 list board (move_tile + is_solved): {lists:12,.0f} moves/s")
+    for size in (3, 4, 5, 8):
+        packed = bench_packed(random_walk(size, MOVES), size)
+        print(f"{size}x{size} PackedState (move + is_solved):  {packed:12,.0f} moves/s")
+    print(f"speed-up at 3x3: {bench_packed(walk, 3) / lists:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
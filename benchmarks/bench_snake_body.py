@@ -0,0 +1,44 @@
+"""
+Benchmark: time per Snake tick for snakes thousands of segments long.
+
+On a MAX_SIDE x MAX_SIDE board the snake follows a cycle through every
+cell, so it never blocks or crosses itself, and is grown to each length
+before the ticks are timed. The body is a deque and the cell queries go
+through the occupancy grid, so a tick should cost the same at every length.
+There are no monsters, which would end the game; food keeps jumping.
+
+Run from the repository root:
+    python -m benchmarks.bench_snake_body
+"""
+
+import time
+
+import snake_engine
+from benchmarks.bench_snake_grid import cycle_directions
+
+TICKS = 20_000
+LENGTHS = (10, 1_000, 10_000, 100_000)
+
+
+def main():
+    side = snake_engine.MAX_SIDE
+    config = snake_engine.BoardConfig(side, side, monster_count=0, win_length=side * side)
+    directions = cycle_directions(side, side, config.start)
+    print(f"{side}x{side} board")
+    for length in LENGTHS:
+        game = snake_engine.SnakeGame(seed=length, config=config)
+        game.size = length
+        k = 0
+        while len(game.body) < length:
+            game.step(directions[k])
+            k += 1
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            game.step(directions[k])
+            k += 1
+        elapsed = time.perf_counter() - start
+        print(f"body {len(game.body):8,} segments: {elapsed / TICKS * 1e6:6.2f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
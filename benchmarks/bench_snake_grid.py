@@ -0,0 +1,96 @@
+"""
+Benchmark: cost of the Snake rules as the body and the entity counts grow.
+
+The snake follows a cycle through every cell of the first 24 columns, so
+its body can grow to hundreds of segments without the game ending, while
+food items and monsters are added by the hundred. A snake move looks up
+food and the game end in the occupancy grid, and a monster move looks up
+contacts in it, so both should cost the same at every size.
+
+Run from the repository root:
+    python -m benchmarks.bench_snake_grid
+"""
+
+import time
+
+import snake_engine
+
+MOVES = 20_000
+BODY_LENGTHS = (20, 200, 580)
+ENTITY_COUNTS = (4, 40, 160)  # monsters, and as many food items
+
+
+def cycle_directions(cols, rows, start):
+    """
+    Arrow keys of a cycle through every cell of `cols` x `rows`, from `start`.
+
+    `cols` must be even: the cycle goes right along row 0, zigzags up and
+    down the columns from the last to column 1, and comes back down column 0.
+    """
+    cells = [(col, 0) for col in range(cols)]
+    for col in range(cols - 1, 0, -1):
+        rows_up = range(1, rows) if (cols - 1 - col) % 2 == 0 else range(rows - 1, 0, -1)
+        cells.extend((col, row) for row in rows_up)
+    cells.extend((0, row) for row in range(rows - 1, 0, -1))
+    k = cells.index(start)
+    cells = cells[k:] + cells[:k]
+    keys = {step: key for key, step in snake_engine.DIRECTIONS.items()}
+    return [keys[(b[0] - a[0], b[1] - a[1])] for a, b in zip(cells, cells[1:] + cells[:1])]
+
+
+def restock(game, count):
+    """Put eaten food back on random cells without food or the head."""
+    grid, rng = game.grid, game.rng
+    while len(game.food) < count:
+        col, row = game.head
+        while grid.at(col, row) & (snake_engine.FOOD | snake_engine.HEAD):
+            col, row = rng.randrange(grid.cols), rng.randrange(grid.rows)
+        grid.add_food(grid.index(col, row), len(game.food))
+        game.food.append([col, row, 1])
+
+
+def measure(length, entities, directions):
+    """Return microseconds per snake move and per monster move."""
+    config = snake_engine.BoardConfig(food_count=0, monster_count=entities,
+                                      win_length=snake_engine.COLS * snake_engine.ROWS)
+    game = snake_engine.SnakeGame(seed=length + entities, config=config)
+    game.size = length
+    for k in range(length):  # grow the body to `length` segments
+        game.direction = directions[k % len(directions)]
+        game._move_snake()
+    restock(game, entities)
+
+    elapsed = 0.0
+    for k in range(length, length + MOVES):
+        game.direction = directions[k % len(directions)]
+        start = time.perf_counter()
+        game._move_snake()
+        elapsed += time.perf_counter() - start
+        game.size = length  # outside the timing, like putting back what was eaten
+        if len(game.food) < entities:
+            restock(game, entities)
+    snake_us = elapsed / MOVES * 1e6
+
+    monster_moves = max(1, MOVES // entities)
+    start = time.perf_counter()
+    for _ in range(monster_moves):
+        for monster in game.monsters:
+            game._step_monster(monster)
+            game._touch(monster)
+            game._check_over()
+    monster_us = (time.perf_counter() - start) / (monster_moves * entities) * 1e6
+    return snake_us, monster_us
+
+
+def main():
+    config = snake_engine.BoardConfig()
+    directions = cycle_directions(config.cols - 1, config.rows, config.start)
+    print(f"{'body':>6} {'entities':>9} {'us/snake move':>14} {'us/monster move':>16}")
+    for length in BODY_LENGTHS:
+        for entities in ENTITY_COUNTS:
+            snake_us, monster_us = measure(length, entities, directions)
+            print(f"{length:6} {entities:9} {snake_us:14.2f} {monster_us:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
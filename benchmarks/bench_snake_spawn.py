@@ -0,0 +1,70 @@
+"""
+Benchmark: cost of picking a spawn cell as the board fills up.
+
+BOARD x BOARD cells are filled with body segments to each occupancy, then
+a spawn is timed SAMPLES times: draw an empty cell, put a monster on it
+and take it off again. The free-cell set of the occupancy grid draws from
+the empty cells directly, so a spawn should cost the same at every
+occupancy; drawing any cell until one is empty, as the original game did,
+is timed alongside and slows down as 1 / (1 - occupancy).
+
+Run from the repository root:
+    python -m benchmarks.bench_snake_spawn
+"""
+
+import random
+import time
+
+import snake_engine
+
+BOARD = 200
+SAMPLES = 20_000
+OCCUPANCIES = (0.5, 0.9, 0.99, 0.999)
+
+
+def filled_grid(occupancy, rng):
+    """An occupancy grid with `occupancy` of its cells under body segments."""
+    grid = snake_engine.OccupancyGrid(BOARD, BOARD)
+    cells = [grid.index(col, row) for row in range(BOARD) for col in range(BOARD)]
+    for k in rng.sample(cells, round(occupancy * len(cells))):
+        grid.add_body(k)
+    return grid
+
+
+def spawn_free(grid, rng):
+    k = grid.free.choice(rng)
+    grid.add_monster(k)
+    grid.remove_monster(k)
+
+
+def spawn_rejection(grid, rng):
+    while True:
+        col, row = rng.randrange(BOARD), rng.randrange(BOARD)
+        if not grid.at(col, row):
+            break
+    k = grid.index(col, row)
+    grid.add_monster(k)
+    grid.remove_monster(k)
+
+
+def measure(spawn, grid, rng):
+    """Return microseconds per spawn."""
+    start = time.perf_counter()
+    for _ in range(SAMPLES):
+        spawn(grid, rng)
+    return (time.perf_counter() - start) / SAMPLES * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{BOARD}x{BOARD} board, us per spawn")
+    print(f"{'occupancy':>10} {'empty cells':>12} {'free set':>10} {'rejection':>10}")
+    for occupancy in OCCUPANCIES:
+        grid = filled_grid(occupancy, rng)
+        free = measure(spawn_free, grid, rng)
+        rejection = measure(spawn_rejection, grid, rng)
+        print(f"{occupancy:10.1%} {len(grid.free):12,} {free:10.2f} {rejection:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: total monster update time per snake move against the number of monsters.
+
+On a BOARD x BOARD board the snake follows a cycle through every cell,
+and after each snake move every monster takes one step and checks for
+contact, as if all of their timers fell in the same snake interval. With
+pursuit='flow' the monsters share one lazy breadth-first search from the
+head per snake move and each step is a lookup; the 'angle' rule of the
+original game is timed alongside for reference.
+
+Run from the repository root:
+    python -m benchmarks.bench_snake_swarm
+"""
+
+import time
+
+import snake_engine
+from benchmarks.bench_snake_grid import cycle_directions
+
+BOARD = 100
+ROUNDS = 200  # snake moves
+MONSTER_COUNTS = (25, 50, 100, 200, 400, 800)
+LENGTH = 30  # body segments, which the flow field routes around
+
+
+def measure(pursuit, monsters, directions):
+    """Return microseconds of monster updates per snake move."""
+    config = snake_engine.BoardConfig(BOARD, BOARD, food_count=0, monster_count=monsters,
+                                      win_length=BOARD * BOARD, pursuit=pursuit)
+    game = snake_engine.SnakeGame(seed=monsters, config=config)
+    game.size = LENGTH
+    k = 0
+    for k in range(LENGTH):
+        game.direction = directions[k]
+        game._move_snake()
+    elapsed = 0.0
+    for k in range(LENGTH, LENGTH + ROUNDS):
+        game.direction = directions[k]
+        game._move_snake()
+        start = time.perf_counter()
+        for monster in game.monsters:
+            game._step_monster(monster)
+            game._touch(monster)
+        elapsed += time.perf_counter() - start
+    return elapsed / ROUNDS * 1e6
+
+
+def main():
+    config = snake_engine.BoardConfig(BOARD, BOARD)
+    directions = cycle_directions(BOARD, BOARD, config.start)
+    print(f"{BOARD}x{BOARD} board, {LENGTH}-segment snake, us of monster updates per snake move")
+    print(f"{'monsters':>9} {'flow':>10} {'per monster':>12} {'angle':>10} {'per monster':>12}")
+    for monsters in MONSTER_COUNTS:
+        flow = measure('flow', monsters, directions)
+        angle = measure('angle', monsters, directions)
+        print(f"{monsters:9} {flow:10.1f} {flow / monsters:12.2f} {angle:10.1f} {angle / monsters:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: inversion counting and puzzle generation from 3x3 to 100x100.
+
+Compares the Fenwick-tree count_inversions() with the pairwise double loop
+the puzzle modules used before, and the parity-repairing generator with
+drawing permutations until one is solvable.
+
+Run from the repository root:
+    python -m benchmarks.bench_solvability
+"""
+
+import random
+import time
+
+from puzzle_generator import generate_solvable_tiles
+from puzzle_solver import EMPTY_SPACE, count_inversions, is_solvable
+
+SIZES = (3, 4, 5, 10, 20, 50, 100)
+
+
+def pairwise_inversions(tiles):
+    """Reference O(n^2) count, as in the original is_solvable."""
+    numbers = [tile for tile in tiles if tile != EMPTY_SPACE]
+    count = 0
+    for i in range(len(numbers)):
+        for j in range(i + 1, len(numbers)):
+            if numbers[i] > numbers[j]:
+                count += 1
+    return count
+
+
+def rejection_tiles(size, rng):
+    """Reference generator: redraw until the board is solvable."""
+    while True:
+        tiles = rng.sample(range(size * size), size * size)
+        if is_solvable(tiles, size):
+            return tiles
+
+
+def timed(function, *args, budget=0.2):
+    """Average seconds per call, repeating for about `budget` seconds."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function(*args)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return elapsed / calls
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>5} {'pairwise':>12} {'fenwick':>12} {'rejection':>12} {'repair':>12}   (ms per board)")
+    for size in SIZES:
+        tiles = generate_solvable_tiles(size, rng)
+        assert count_inversions(tiles) == pairwise_inversions(tiles)
+        row = [timed(pairwise_inversions, tiles), timed(count_inversions, tiles),
+               timed(rejection_tiles, size, rng), timed(generate_solvable_tiles, size, rng)]
+        print(f"{size:>5} " + ' '.join(f"{seconds * 1000:12.3f}" for seconds in row))
+
+
+if __name__ == "__main__":
+    main()
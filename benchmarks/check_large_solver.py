@@ -0,0 +1,67 @@
+"""
+Check: the constructive solver solves boards a few moves from solved.
+
+Nearly solved boards put the last two tiles of a row or column right next
+to their cells, where they once walled the empty space off from the window
+it finishes them in. For every size from MIN_SIZE to MAX_SIZE, BOARDS
+boards are scrambled 1 to MAX_SCRAMBLE random moves away from solved, and
+the moves solve_large() returns must be legal and end on the solved board.
+
+Exits with status 1 if a board fails, so it can gate a change.
+
+Run from the repository root:
+    python -m benchmarks.check_large_solver
+"""
+
+import random
+import sys
+
+from large_puzzle_solver import MIN_CONSTRUCTIVE_SIZE, solve_large
+from puzzle_board import PuzzleBoard
+
+MIN_SIZE = MIN_CONSTRUCTIVE_SIZE
+MAX_SIZE = 12
+BOARDS = 100  # per size
+MAX_SCRAMBLE = 40
+
+
+def scrambled(size, rng):
+    """A board `size` wide, 1 to MAX_SCRAMBLE random moves from solved."""
+    board = PuzzleBoard.solved(size)
+    for _ in range(rng.randint(1, MAX_SCRAMBLE)):
+        board.move(rng.choice(board.valid_moves()))
+    return board
+
+
+def check(board):
+    """Return None if solve_large() solves `board`, else what went wrong."""
+    try:
+        moves = solve_large(board.tiles, board.size)
+    except (RuntimeError, ValueError) as error:
+        return f"{type(error).__name__}: {error}"
+    board = board.copy()
+    for move in moves:
+        if not board.move(move):
+            return f"illegal move {move!r}"
+    return None if board.is_solved() else "not solved"
+
+
+def main():
+    rng = random.Random(0)
+    failures = 0
+    for size in range(MIN_SIZE, MAX_SIZE + 1):
+        failed = 0
+        for _ in range(BOARDS):
+            board = scrambled(size, rng)
+            problem = check(board)
+            if problem is not None:
+                failed += 1
+                print(f"{size}x{size} {board.tiles}: {problem}")
+        print(f"{size}x{size}: {BOARDS - failed}/{BOARDS} solved")
+        failures += failed
+    print("FAIL" if failures else "OK")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
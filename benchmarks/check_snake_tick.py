@@ -0,0 +1,124 @@
+"""
+Check: a steady-state Snake tick keeps no new objects and meets its time budget.
+
+A snake runs away from the default monsters on a BOARD x BOARD board with
+the default food, and WARMUP ticks let it reach its length. Then TICKS
+ticks run under tracemalloc and the traced memory may never rise more than
+ALLOCATION_SLACK bytes above where it started. Ticks still make
+temporaries: CPython boxes every int above 256, so the clock and the
+pending events hold a few dozen ints that are replaced as they run, and its
+freelists hand back freed floats and tuples without tracemalloc seeing the
+free; the traced memory moves by a few hundred bytes either way. A tick
+that kept an object, though, would add up over the run. A second pass
+without tracemalloc times every tick with perf_counter; the 99th
+percentile must stay within TICK_BUDGET (the rest allows for the scheduler
+of a busy machine). When a monster catches the snake anyway, the next game
+is warmed up and measured from there.
+
+Exits with status 1 if a check fails, so it can gate a change.
+
+Run from the repository root:
+    python -m benchmarks.check_snake_tick
+"""
+
+import sys
+import time
+import tracemalloc
+
+import snake_engine
+
+BOARD = 120
+TICKS = 5_000
+WARMUP = 200
+TICK_BUDGET = 75e-6  # seconds, for the 99th percentile
+ALLOCATION_SLACK = 1024  # bytes the traced memory may rise by, see above
+
+
+class _Player:
+    """
+    Keeps a snake running away from the monsters, starting a new game
+    whenever one ends anyway. Moves are chosen before a tick is measured.
+    """
+
+    def __init__(self):
+        self.config = snake_engine.BoardConfig(BOARD, BOARD, win_length=BOARD * BOARD)
+        self.games = 0
+        self._new_game()
+
+    def _new_game(self):
+        self.game = snake_engine.SnakeGame(seed=self.games, config=self.config)
+        self.games += 1
+        for _ in range(WARMUP):
+            self.ready()
+            self.tick()
+
+    def _flee(self):
+        """The move to the free cell farthest from the nearest monster, away from the walls."""
+        game = self.game
+        col, row = game.head
+        best, best_score = None, None
+        for key, (d_col, d_row) in snake_engine.DIRECTIONS.items():
+            c, r = col + d_col, row + d_row
+            if not self.config.inside(c, r):
+                continue
+            nearest = min(abs(c - m_col) + abs(r - m_row) for m_col, m_row in game.monsters)
+            score = nearest - 0.2 * (abs(c - BOARD / 2) + abs(r - BOARD / 2))
+            if best_score is None or score > best_score:
+                best, best_score = key, score
+        return best
+
+    def ready(self):
+        """Start a new game if the last one ended and choose the next move."""
+        if self.game.over:
+            self._new_game()
+        self.action = self._flee()
+
+    def tick(self):
+        self.game.step(self.action)
+
+
+def check_allocations(player):
+    """
+    Return how far the traced memory rose above its level at the start of
+    the game, at most and after the last tick, in bytes.
+    """
+    tracemalloc.start()
+    player.ready()
+    games, start, highest = player.games, tracemalloc.get_traced_memory()[0], 0
+    for _ in range(TICKS):
+        player.tick()
+        kept = tracemalloc.get_traced_memory()[0] - start
+        highest = max(highest, kept)
+        player.ready()
+        if player.games != games:  # a new game, with new memory
+            games, start = player.games, tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return highest, kept
+
+
+def check_time(player):
+    """Return the 99th percentile and the largest tick time in seconds."""
+    times = []
+    for _ in range(TICKS):
+        player.ready()
+        start = time.perf_counter()
+        player.tick()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[int(0.99 * len(times))], times[-1]
+
+
+def main():
+    player = _Player()
+    highest, kept = check_allocations(player)
+    p99, slowest = check_time(player)
+    print(f"{TICKS} ticks on {BOARD}x{BOARD}, {player.games} game(s)")
+    print(f"memory: {kept:+} bytes after the ticks, at most {highest:+}, slack {ALLOCATION_SLACK}")
+    print(f"time: p99 {p99 * 1e6:.1f} us, max {slowest * 1e6:.1f} us, budget {TICK_BUDGET * 1e6:.0f} us")
+    failed = highest > ALLOCATION_SLACK or p99 > TICK_BUDGET
+    print("FAIL" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
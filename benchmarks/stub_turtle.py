@@ -0,0 +1,98 @@
+"""
+Headless stand-in for the turtle module.
+
+install() puts it in sys.modules under the name 'turtle', so that
+GUI_sliding_puzzle.py can be imported and driven without a Tk window.
+Turtles only remember their position and count how many were created;
+ontimer callbacks are queued and run by run_timers().
+"""
+
+import sys
+
+created = 0  # Turtles created since install()
+timers = []  # (delay in ms, callback) waiting for run_timers()
+
+
+class Turtle:
+    def __init__(self, shape='classic', visible=True, **kwargs):
+        global created
+        created += 1
+        self._x = self._y = 0.0
+        self._visible = visible
+
+    def goto(self, x, y=None):
+        if y is None:
+            x, y = x
+        self._x, self._y = x, y
+
+    setposition = setpos = goto
+
+    def xcor(self):
+        return self._x
+
+    def ycor(self):
+        return self._y
+
+    def pos(self):
+        return self._x, self._y
+
+    position = pos
+
+    def isvisible(self):
+        return self._visible
+
+    def hideturtle(self):
+        self._visible = False
+
+    def showturtle(self):
+        self._visible = True
+
+    ht, st = hideturtle, showturtle
+
+    def _ignore(self, *args, **kwargs):
+        pass
+
+    penup = up = pendown = down = shape = color = shapesize = speed = write = clear = \
+        fillcolor = pencolor = setheading = stamp = clearstamp = clearstamps = _ignore
+
+
+class Screen:
+    def __init__(self):
+        pass
+
+    def __getattr__(self, name):
+        return _ignore
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+tracer = update = listen = onkey = onkeypress = onscreenclick = mainloop = bye = _ignore
+
+
+def ontimer(callback, delay=0):
+    timers.append((delay, callback))
+
+
+def run_timers():
+    """Run queued ontimer callbacks, including the ones they schedule, until none are left."""
+    while timers:
+        _, callback = timers.pop(0)
+        callback()
+
+
+def numinput(title, prompt, default=None, minval=None, maxval=None):
+    return default
+
+
+def textinput(title, prompt):
+    return None
+
+
+def install():
+    """Register this module as 'turtle' and reset the counters."""
+    global created
+    created = 0
+    timers.clear()
+    sys.modules['turtle'] = sys.modules[__name__]
@@ -0,0 +1,323 @@
+"""
+Reproducible benchmark suite for the sliding-puzzle core.
+
+Every case times one function of CLI_sliding_puzzle.py or
+GUI_sliding_puzzle.py (the GUI through benchmarks.stub_turtle, so no
+window opens) on inputs drawn from a fixed seed, for sizes 3 to 5 and
+larger synthetic sizes where the function supports them. A case runs
+`--warmup` untimed rounds and `--repetitions` timed rounds; the JSON output
+keeps the time per call of every round and their summary.
+
+Run from the repository root:
+    python -m benchmarks.suite run -o before.json
+    python -m benchmarks.suite run -o after.json --filter gui.
+    python -m benchmarks.suite compare before.json after.json --threshold 0.10
+
+compare prints the change of the time per call of every case found in
+both files (the fastest round by default, which is the least disturbed by
+other load; --statistic median is also available) and exits with status 1
+if any case is slower by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from benchmarks import stub_turtle
+
+stub_turtle.install()
+
+import CLI_sliding_puzzle as cli  # noqa: E402  (needs the stub installed first)
+import GUI_sliding_puzzle as gui  # noqa: E402
+import puzzle_generator  # noqa: E402
+from puzzle_board import PuzzleBoard  # noqa: E402
+from puzzle_solver import BLANK_OFFSETS  # noqa: E402
+
+SEED = 2024
+WARMUP = 2
+REPETITIONS = 7
+CALLS = 2000  # calls per round
+SIZES = (3, 4, 5)
+LARGE_SIZES = (8, 16, 32)
+KEYS = {'left': 'a', 'right': 'd', 'up': 'w', 'down': 's'}
+
+CASES = {}
+
+
+def case(name, sizes=(3,)):
+    """
+    Register a case factory for each size.
+
+    factory(size, rng) prepares the inputs and returns (run, calls): a
+    function doing one round and the number of calls it makes.
+    """
+    def register(factory):
+        for size in sizes:
+            CASES[f"{name}[{size}]"] = (factory, size)
+        return factory
+    return register
+
+
+def _puzzles(size, rng, count=CALLS):
+    return [puzzle_generator.generate_solvable_puzzle(size, rng) for _ in range(count)]
+
+
+def _walk(board, rng, count=CALLS):
+    """Random legal directions from `board`, without changing it."""
+    board = board.copy()
+    walk = []
+    for _ in range(count):
+        direction = rng.choice(board.valid_moves())
+        board.move(direction)
+        walk.append(direction)
+    return walk
+
+
+# CLI_sliding_puzzle.py
+
+@case('cli.is_solvable')
+def _cli_is_solvable(size, rng):
+    puzzles = _puzzles(size, rng)
+    is_solvable = cli.is_solvable
+
+    def run():
+        for puzzle in puzzles:
+            is_solvable(puzzle)
+    return run, CALLS
+
+
+@case('cli.generate_solvable_puzzle')
+def _cli_generate(size, rng):
+    def run():
+        for _ in range(CALLS):
+            cli.generate_solvable_puzzle()
+    return run, CALLS
+
+
+@case('cli.move_tile.list')
+def _cli_move_list(size, rng):
+    puzzle = puzzle_generator.generate_solvable_puzzle(size, rng)
+    keys = [KEYS[direction] for direction in _walk(PuzzleBoard.from_puzzle(puzzle), rng)]
+
+    def run():
+        board = [row[:] for row in puzzle]
+        for key in keys:
+            cli.move_tile(board, key, KEYS)
+    return run, CALLS
+
+
+@case('cli.move_tile.board', SIZES + LARGE_SIZES)
+def _cli_move_board(size, rng):
+    start = PuzzleBoard.from_puzzle(puzzle_generator.generate_solvable_puzzle(size, rng))
+    keys = [KEYS[direction] for direction in _walk(start, rng)]
+
+    def run():
+        board = start.copy()
+        for key in keys:
+            cli.move_tile(board, key, KEYS)
+    return run, CALLS
+
+
+@case('cli.find_empty_space', SIZES + LARGE_SIZES)
+def _cli_find_empty(size, rng):
+    puzzles = _puzzles(size, rng, CALLS // size)
+
+    def run():
+        for puzzle in puzzles:
+            cli.find_empty_space(puzzle)
+    return run, len(puzzles)
+
+
+@case('cli.is_solved')
+def _cli_is_solved(size, rng):
+    puzzles = _puzzles(size, rng)
+
+    def run():
+        for puzzle in puzzles:
+            cli.is_solved(puzzle)
+    return run, CALLS
+
+
+# GUI_sliding_puzzle.py
+
+def _gui_game(size, rng):
+    gui.puzzle_size = size
+    gui.board = PuzzleBoard.from_puzzle(puzzle_generator.generate_solvable_puzzle(size, rng))
+    gui.display_puzzle(gui.board)
+
+
+@case('gui.is_solvable', SIZES + LARGE_SIZES)
+def _gui_is_solvable(size, rng):
+    puzzles = _puzzles(size, rng, CALLS // size)
+
+    def run():
+        for puzzle in puzzles:
+            gui.is_solvable(puzzle)
+    return run, len(puzzles)
+
+
+@case('gui.generate_solvable_puzzle', SIZES + LARGE_SIZES)
+def _gui_generate(size, rng):
+    def run():
+        gui.puzzle_size = size
+        for _ in range(CALLS // size):
+            gui.generate_solvable_puzzle()
+    return run, CALLS // size
+
+
+@case('gui.find_empty_space', SIZES + LARGE_SIZES)
+def _gui_find_empty(size, rng):
+    _gui_game(size, rng)
+
+    def run():
+        for _ in range(CALLS):
+            gui.find_empty_space()
+    return run, CALLS
+
+
+@case('gui.is_solved', SIZES + LARGE_SIZES)
+def _gui_is_solved(size, rng):
+    _gui_game(size, rng)
+
+    def run():
+        for _ in range(CALLS):
+            gui.is_solved()
+    return run, CALLS
+
+
+@case('gui.on_mouse_click', SIZES + LARGE_SIZES)
+def _gui_click(size, rng):
+    _gui_game(size, rng)
+    start = gui.board.copy()
+    clicks = []
+    board = start.copy()
+    for direction in _walk(start, rng):
+        empty_row, empty_col = board.empty_position
+        d_row, d_col = BLANK_OFFSETS[direction]
+        clicks.append(gui.get_screen_coordinates(empty_row + d_row, empty_col + d_col))
+        board.move(direction)
+
+    def run():
+        # Each round replays the same clicks from the same board.
+        _reset_gui(size, start)
+        for x, y in clicks:
+            gui.on_mouse_click(x, y)
+    return run, CALLS
+
+
+def _reset_gui(size, start):
+    gui.puzzle_size = size
+    gui.board = start.copy()
+    gui.display_puzzle(gui.board)
+
+
+def measure(run, calls, warmup=WARMUP, repetitions=REPETITIONS):
+    """Seconds per call of each timed round."""
+    for _ in range(warmup):
+        run()
+    rounds = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        run()
+        rounds.append((time.perf_counter() - start) / calls)
+    return rounds
+
+
+def run_suite(names, warmup=WARMUP, repetitions=REPETITIONS, verbose=True):
+    results = {}
+    for name in names:
+        factory, size = CASES[name]
+        rng = random.Random(f"{SEED}:{name}")
+        random.seed(f"{SEED}:{name}")  # for the functions using the random module
+        run, calls = factory(size, rng)
+        rounds = measure(run, calls, warmup, repetitions)
+        results[name] = {
+            'calls': calls,
+            'rounds': rounds,
+            'median': statistics.median(rounds),
+            'min': min(rounds),
+            'stdev': statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        }
+        if verbose:
+            print(f"{name:40} {results[name]['median'] * 1e6:10.2f} us/call", file=sys.stderr)
+    return results
+
+
+def compare(old, new, threshold, statistic='min'):
+    """
+    Print the change of `statistic` for every case in both result sets.
+
+    Returns:
+        list: names of the cases slower by more than `threshold`.
+    """
+    regressions = []
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name][statistic], new[name][statistic]
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:40} {before * 1e6:10.2f} -> {after * 1e6:10.2f} us/call {change:+8.1%}{flag}")
+    for name in sorted(set(old) ^ set(new)):
+        print(f"{name:40} only in {'the first' if name in old else 'the second'} file")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the sliding-puzzle core.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help="run the cases and write JSON")
+    run_parser.add_argument('-o', '--output', default='-', help="JSON file, '-' for stdout")
+    run_parser.add_argument('--filter', default='', help="only the cases whose name contains this")
+    run_parser.add_argument('--warmup', type=int, default=WARMUP)
+    run_parser.add_argument('--repetitions', type=int, default=REPETITIONS)
+    run_parser.add_argument('--list', action='store_true', help="list the cases and exit")
+    compare_parser = subparsers.add_parser('compare', help="compare two JSON result files")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help="relative slow-down flagged as a regression (default 0.10)")
+    compare_parser.add_argument('--statistic', choices=('min', 'median'), default='min')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)['results']
+        with open(args.new) as f:
+            new = json.load(f)['results']
+        regressions = compare(old, new, args.threshold, args.statistic)
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+    names = [name for name in CASES if args.filter in name]
+    if args.list:
+        print('\n'.join(names))
+        return
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': SEED,
+            'warmup': args.warmup,
+            'repetitions': args.repetitions,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': run_suite(names, args.warmup, args.repetitions),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Exact distance table for every 3x3 board.
+
+Each permutation of the 9 cells is mapped to a unique index in [0, 9!) by
+its Lehmer code, a perfect hash. A one-time breadth-first search from the
+solved board fills one byte per index with the optimal number of moves
+(UNREACHABLE for the unsolvable half) and saves it as a binary file. The
+file is then opened with mmap, so the optimal distance, the solvability
+and an optimal solution of any board are table lookups.
+"""
+
+import mmap
+import os
+import random
+from array import array
+from collections import deque
+
+from puzzle_solver import EMPTY_SPACE, get_tables, goal_state
+
+SIZE = 3
+CELLS = SIZE * SIZE
+UNREACHABLE = 0xFF
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eight_puzzle.dist')
+
+FACTORIALS = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)
+TABLE_SIZE = 362880  # 9!
+
+_table = None
+_buckets = None
+
+
+def rank(tiles):
+    """
+    Lehmer code of a 3x3 board given as a flat sequence of 9 tiles.
+
+    The i-th digit counts the later tiles that are smaller than tiles[i];
+    weighting the digits by (8 - i)! gives a unique index below 9!.
+    """
+    index = 0
+    for i in range(CELLS - 1):
+        tile = tiles[i]
+        smaller = 0
+        for j in range(i + 1, CELLS):
+            if tiles[j] < tile:
+                smaller += 1
+        index += smaller * FACTORIALS[i]
+    return index
+
+
+def unrank(index):
+    """Inverse of rank(): return the flat board with the given Lehmer code."""
+    remaining = list(range(CELLS))
+    tiles = []
+    for factorial in FACTORIALS:
+        digit, index = divmod(index, factorial)
+        tiles.append(remaining.pop(digit))
+    return tiles
+
+
+def build_table(path=DEFAULT_PATH):
+    """
+    Fill the distance table by BFS from the solved board and save it.
+
+    Returns:
+        bytearray: the table, indexed by rank().
+    """
+    neighbors = get_tables(SIZE)[0]
+    goal = goal_state(SIZE)
+    seen = {goal: 0}
+    queue = deque([(goal, CELLS - 1)])
+    while queue:
+        tiles, blank = queue.popleft()
+        depth = seen[tiles] + 1
+        for target, _ in neighbors[blank]:
+            child = list(tiles)
+            child[blank], child[target] = child[target], EMPTY_SPACE
+            child = tuple(child)
+            if child not in seen:
+                seen[child] = depth
+                queue.append((child, target))
+
+    table = bytearray([UNREACHABLE]) * TABLE_SIZE
+    for tiles, depth in seen.items():
+        table[rank(tiles)] = depth
+    temp = path + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(table)
+    os.replace(temp, path)
+    return table
+
+
+def load_table(path=DEFAULT_PATH):
+    """
+    Open the distance table with mmap, building the file first if needed.
+
+    The table is cached, later calls return the same mapping.
+    """
+    global _table
+    if _table is None:
+        if not os.path.exists(path) or os.path.getsize(path) != TABLE_SIZE:
+            build_table(path)
+        with open(path, 'rb') as f:
+            _table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _table
+
+
+def optimal_distance(puzzle):
+    """
+    Optimal number of moves to solve a 3x3 list-of-lists puzzle.
+
+    Returns:
+        int or None: the distance, or None if the puzzle is not solvable.
+    """
+    depth = load_table()[rank([tile for row in puzzle for tile in row])]
+    return None if depth == UNREACHABLE else depth
+
+
+def optimal_solution(puzzle):
+    """
+    Moves of an optimal solution, found by stepping down the table.
+
+    Raises:
+        ValueError: if the puzzle cannot be solved.
+    """
+    table = load_table()
+    neighbors = get_tables(SIZE)[0]
+    tiles = [tile for row in puzzle for tile in row]
+    remaining = table[rank(tiles)]
+    if remaining == UNREACHABLE:
+        raise ValueError("The puzzle is not solvable.")
+    blank = tiles.index(EMPTY_SPACE)
+    moves = []
+    while remaining:
+        for target, direction in neighbors[blank]:
+            tiles[blank], tiles[target] = tiles[target], EMPTY_SPACE
+            if table[rank(tiles)] == remaining - 1:
+                break
+            tiles[target], tiles[blank] = tiles[blank], EMPTY_SPACE
+        moves.append(direction)
+        blank = target
+        remaining -= 1
+    return moves
+
+
+def boards_at_distance(depth):
+    """
+    Ranks of every board whose optimal solution is `depth` moves long.
+
+    The table is bucketed by distance on first use and the buckets are kept
+    in memory, so repeated queries cost nothing.
+    """
+    global _buckets
+    if _buckets is None:
+        table = load_table()[:]
+        deepest = max(value for value in table if value != UNREACHABLE)
+        _buckets = [array('I') for _ in range(deepest + 1)]
+        for index, value in enumerate(table):
+            if value != UNREACHABLE:
+                _buckets[value].append(index)
+    if not 0 <= depth < len(_buckets):
+        raise ValueError(f"3x3 boards are between 0 and {len(_buckets) - 1} moves from solved.")
+    return _buckets[depth]
+
+
+def random_board_at_distance(depth, rng=random):
+    """Return a uniformly chosen flat 3x3 board exactly `depth` moves from solved."""
+    return unrank(rng.choice(boards_at_distance(depth)))
@@ -0,0 +1,113 @@
+"""
+Deterministic event scheduler on a virtual clock.
+
+Events wait in one heapq ordered by time, then priority, then the order in
+which they were scheduled, so the same events always run in the same
+order. run_until() dispatches them up to a time: a headless simulation
+calls it back to back and runs as fast as the CPU allows, while a GUI
+calls it from a single timer with the time elapsed on the wall clock.
+stop() drops every pending event at once and refuses new ones.
+
+An event is a list [time, priority, number, callback, argument] that the
+scheduler hands back; something that happens again and again, like a
+monster move, reschedules the same event instead of making a new one.
+"""
+
+import heapq
+
+
+class Scheduler:
+    """
+    Events on a virtual clock, usually in milliseconds.
+
+    Attributes:
+        time: time of the event being dispatched, or the time the last
+            run_until() ran to
+        stopped: whether stop() was called
+    """
+
+    def __init__(self, time=0):
+        self.time = time
+        self.stopped = False
+        self._queue = []
+        self._count = 0  # events scheduled, which orders events with the same time and priority
+
+    def __len__(self):
+        return len(self._queue)
+
+    def schedule(self, at, callback, argument=None, priority=0):
+        """
+        Call callback(argument) at time `at`.
+
+        Among events at the same time, the lower priority runs first, then
+        the event scheduled first. Nothing is scheduled once stopped.
+
+        Returns:
+            list: the event, for reschedule().
+        """
+        event = [at, priority, 0, callback, argument]
+        self.reschedule(event, at)
+        return event
+
+    def reschedule(self, event, at):
+        """Schedule an event again, at time `at`; it must not be pending already."""
+        if self.stopped:
+            return
+        self._count += 1
+        event[0] = at
+        event[2] = self._count
+        heapq.heappush(self._queue, event)
+
+    def next_time(self):
+        """Time of the next event, or None if there is none."""
+        return self._queue[0][0] if self._queue else None
+
+    def run_until(self, until, priority=None):
+        """
+        Dispatch the events up to time `until`, in order, and move the clock there.
+
+        Args:
+            until: last time to dispatch events at
+            priority: if given, the events at exactly `until` with a higher
+                priority stay pending
+
+        Returns:
+            bool: False once the scheduler is stopped.
+        """
+        queue = self._queue
+        while queue and not self.stopped:
+            at, order = queue[0][0], queue[0][1]
+            if at > until or (at == until and priority is not None and order > priority):
+                break
+            event = heapq.heappop(queue)
+            if at > self.time:
+                self.time = at
+            event[3](event[4])
+        if self.stopped:
+            return False
+        if until > self.time:
+            self.time = until
+        return True
+
+    def run(self, limit=None):
+        """
+        Fast-forward: dispatch events until none is left, the scheduler is
+        stopped or the next event comes after `limit`.
+
+        Returns:
+            bool: False once the scheduler is stopped.
+        """
+        queue = self._queue
+        while queue and not self.stopped:
+            if limit is not None and queue[0][0] > limit:
+                break
+            event = heapq.heappop(queue)
+            if event[0] > self.time:
+                self.time = event[0]
+            event[3](event[4])
+        return not self.stopped
+
+    def stop(self):
+        """Cancel every pending event; nothing runs or is scheduled after this."""
+        self.stopped = True
+        self._queue.clear()
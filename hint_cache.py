@@ -0,0 +1,194 @@
+"""
+Transposition cache for hint queries.
+
+Mirroring a board along its main diagonal and renaming every tile after the
+goal cell it is mirrored to gives another board of the same size with the
+same optimal distance: the solved board maps to itself, and a solution of
+one maps to a solution of the other by swapping left with up and right with
+down. Each board is stored under the smaller of the two forms, so a
+position and its mirror share one entry.
+
+Solutions live in a bounded LRU in memory with hit, miss and eviction
+counters, and optionally in a sqlite file that survives restarts; the games
+only open one when given --hint-cache. Storing a solution also stores every
+board along it, so a player who follows the hints gets the next one from
+the cache.
+"""
+
+import sqlite3
+from collections import OrderedDict
+
+from puzzle_solver import EMPTY_SPACE, flatten
+
+DEFAULT_CAPACITY = 100000
+
+# Moves are stored one letter each.
+CODES = {'left': 'l', 'right': 'r', 'up': 'u', 'down': 'd'}
+MOVES = {code: move for move, code in CODES.items()}
+MIRRORED_MOVE = {'left': 'up', 'up': 'left', 'right': 'down', 'down': 'right'}
+
+_transposes = {}
+
+
+def get_transpose(size):
+    """
+    Cell and tile permutations of the diagonal mirror, cached per size.
+
+    Returns:
+        tuple: (cells, labels) where the tile on `cell` moves to cells[cell]
+        and is renamed labels[tile].
+    """
+    if size not in _transposes:
+        cells = [col * size + row for row in range(size) for col in range(size)]
+        labels = [EMPTY_SPACE] + [cells[tile - 1] + 1 for tile in range(1, size * size)]
+        _transposes[size] = (cells, labels)
+    return _transposes[size]
+
+
+def canonical(tiles, size):
+    """
+    Canonical form of a flat board.
+
+    Returns:
+        tuple: (key, mirrored) where key is the smaller of the board and its
+        mirror as bytes and mirrored tells whether the mirror was chosen.
+    """
+    cells, labels = get_transpose(size)
+    mirror = [0] * len(tiles)
+    for cell, tile in enumerate(tiles):
+        mirror[cells[cell]] = labels[tile]
+    tiles = list(tiles)
+    if mirror < tiles:
+        return bytes(mirror), True
+    return bytes(tiles), False
+
+
+def _encode(moves, mirrored):
+    if mirrored:
+        moves = [MIRRORED_MOVE[move] for move in moves]
+    return ''.join(CODES[move] for move in moves)
+
+
+def _decode(codes, mirrored):
+    moves = [MOVES[code] for code in codes]
+    if mirrored:
+        moves = [MIRRORED_MOVE[move] for move in moves]
+    return moves
+
+
+class TranspositionCache:
+    """
+    Bounded LRU of solutions keyed by canonical board, with an optional
+    sqlite tier.
+
+    Attributes:
+        hits: lookups answered from memory
+        disk_hits: lookups answered from the sqlite file
+        misses: lookups that found nothing
+        evictions: entries dropped from memory to respect the capacity
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None):
+        self.capacity = capacity
+        self._entries = OrderedDict()  # key -> (codes, optimal)
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                             "(key BLOB PRIMARY KEY, moves TEXT NOT NULL, optimal INTEGER NOT NULL)")
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, puzzle):
+        """
+        Cached solution of a list-of-lists puzzle.
+
+        Returns:
+            tuple or None: (moves, optimal), or None on a miss.
+        """
+        size = len(puzzle)
+        key, mirrored = canonical(flatten(puzzle), size)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        elif self._db is not None:
+            row = self._db.execute("SELECT moves, optimal FROM solutions WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is not None:
+                entry = (row[0], bool(row[1]))
+                self._remember(key, entry)
+                self.disk_hits += 1
+        if entry is None:
+            self.misses += 1
+            return None
+        return _decode(entry[0], mirrored), entry[1]
+
+    def put(self, puzzle, moves, optimal=True):
+        """
+        Store a solution of `puzzle` and of every board along it.
+
+        A non-optimal solution never replaces an optimal one, nor a shorter
+        non-optimal one.
+        """
+        size = len(puzzle)
+        tiles = flatten(puzzle)
+        blank = tiles.index(EMPTY_SPACE)
+        offsets = {'left': 1, 'right': -1, 'up': size, 'down': -size}
+        rows = []
+        for step in range(len(moves) + 1):
+            key, mirrored = canonical(tiles, size)
+            current = self._entries.get(key)
+            if (current is None or optimal
+                    or not current[1] and len(moves) - step < len(current[0])):
+                entry = (_encode(moves[step:], mirrored), optimal)
+                self._remember(key, entry)
+                rows.append((key,) + entry)
+            if step < len(moves):
+                target = blank + offsets[moves[step]]
+                tiles[blank], tiles[target] = tiles[target], EMPTY_SPACE
+                blank = target
+        if self._db is not None and rows:
+            statement = "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)"
+            if not optimal:
+                statement = ("INSERT INTO solutions VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                             "SET moves = excluded.moves "
+                             "WHERE NOT optimal AND length(excluded.moves) < length(moves)")
+            self._db.executemany(statement, rows)
+            self._db.commit()
+
+    def solve(self, puzzle, solver):
+        """
+        Optimal solution of `puzzle`, from the cache or from `solver(puzzle)`.
+
+        Returns:
+            list: the moves, as returned by the solver.
+        """
+        cached = self.get(puzzle)
+        if cached is not None and cached[1]:
+            return cached[0]
+        moves = solver(puzzle)
+        self.put(puzzle, moves)
+        return moves
+
+    def stats(self):
+        """One-line report of the counters."""
+        lookups = self.hits + self.disk_hits + self.misses
+        rate = (self.hits + self.disk_hits) / lookups if lookups else 0
+        return (f"{self.hits} hits, {self.disk_hits} disk hits, {self.misses} misses "
+                f"({rate:.0%} hit rate), {self.evictions} evictions, {len(self)} entries")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,332 @@
+"""
+Constructive solver for large sliding puzzles.
+
+IDA* stops being practical beyond 5x5, so big boards are solved the way a
+person would: the top row is put in place tile by tile, then the left
+column, shrinking the unsolved part of the board by one row and one column
+each round until only a 3x3 corner is left, which is finished optimally by
+IDA*. The result is not optimal but it is found in polynomial time.
+
+Each tile is walked towards its cell one step at a time; for every step
+the empty space is routed around the tile by a breadth-first search that
+never enters cells already solved. The last two tiles of a row (or column)
+cannot be placed that way, so they are gathered next to their cells and
+finished by a tiny exact search.
+
+A post-pass removes redundant moves: whenever the board returns to an
+earlier state the loop in between is cut, and whenever it reaches a state
+one move away from an earlier one the detour is replaced by that move.
+"""
+
+from puzzle_solver import BLANK_OFFSETS, EMPTY_SPACE, get_tables, ida_star, is_solvable
+
+# Smallest board handled by the constructive phase; smaller ones use IDA*.
+MIN_CONSTRUCTIVE_SIZE = 4
+CORNER = 3
+
+
+class _Board:
+    """Mutable flat board that records every move of the empty space."""
+
+    def __init__(self, tiles, size):
+        self.size = size
+        self.tiles = list(tiles)
+        self.where = [0] * len(self.tiles)
+        for cell, tile in enumerate(self.tiles):
+            self.where[tile] = cell
+        self.locked = bytearray(len(self.tiles))
+        self.neighbors = [tuple(target for target, _ in moves) for moves in get_tables(size)[0]]
+        self.path = []  # cells the empty space moved to, in order
+        self._seen = [0] * len(self.tiles)
+        self._parent = [0] * len(self.tiles)
+        self._stamp = 0
+
+    def slide(self, target):
+        """Move the empty space to the neighbouring cell `target`."""
+        tiles, where = self.tiles, self.where
+        blank = where[EMPTY_SPACE]
+        tile = tiles[target]
+        tiles[blank], where[tile] = tile, blank
+        tiles[target], where[EMPTY_SPACE] = EMPTY_SPACE, target
+        self.path.append(target)
+
+    def route_blank(self, goal, avoid):
+        """Bring the empty space to `goal` without entering locked cells or `avoid`."""
+        self.route_blank_into((goal,), avoid)
+
+    def route_blank_into(self, goals, avoid):
+        """Bring the empty space to the nearest of the cells `goals` it can reach."""
+        start = self.where[EMPTY_SPACE]
+        if start in goals:
+            return
+        self._stamp += 1
+        stamp, seen, parent, locked = self._stamp, self._seen, self._parent, self.locked
+        seen[start] = stamp
+        frontier = [start]
+        goal = None
+        while frontier and goal is None:
+            following = []
+            for cell in frontier:
+                for target in self.neighbors[cell]:
+                    if seen[target] != stamp and not locked[target] and target != avoid:
+                        seen[target] = stamp
+                        parent[target] = cell
+                        following.append(target)
+                        if target in goals:
+                            goal = target
+            frontier = following
+        if goal is None:
+            raise RuntimeError("The empty space cannot reach the requested cell.")
+        route = []
+        cell = goal
+        while cell != start:
+            route.append(cell)
+            cell = parent[cell]
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def place(self, tile, goal, rows_first):
+        """
+        Walk `tile` to `goal` one cell at a time.
+
+        Each step goes towards the goal along one axis, preferring rows or
+        columns as asked and falling back to the other axis when the next
+        cell is locked.
+        """
+        size = self.size
+        goal_row, goal_col = divmod(goal, size)
+        while self.where[tile] != goal:
+            cell = self.where[tile]
+            row, col = divmod(cell, size)
+            steps = []
+            if col != goal_col:
+                steps.append(cell + (1 if goal_col > col else -1))
+            if row != goal_row:
+                steps.append(cell + (size if goal_row > row else -size))
+            if rows_first:
+                steps.reverse()
+            step = next(step for step in steps if not self.locked[step])
+            self.route_blank(step, avoid=cell)
+            self.slide(cell)
+
+    def lock(self, *cells):
+        for cell in cells:
+            self.locked[cell] = 1
+
+    def unlock(self, *cells):
+        for cell in cells:
+            self.locked[cell] = 0
+
+    def place_pair(self, a, b, window, rows_first):
+        """
+        Put the last two tiles of a row or column on cells `a` and `b`.
+
+        Walking them in one by one would lock the first tile in a dead end,
+        so both tiles and the empty space are first gathered in a small
+        `window` of free cells around the two targets, then an exact
+        breadth-first search over (first tile, second tile, empty space)
+        positions inside the window finishes the job.
+        """
+        first, second = a + 1, b + 1
+        if self.tiles[a] == first and self.tiles[b] == second:
+            return
+        self.place(first, b, rows_first)
+        self.lock(b)
+        if self.where[second] not in window:
+            if self.where[EMPTY_SPACE] == a:
+                # a is a dead end next to the parked tile; step out of it.
+                self.slide(next(cell for cell in self.neighbors[a] if not self.locked[cell]))
+            self.place(second, window[-1], rows_first)
+        self.lock(self.where[second])
+        # The second tile may wall off part of the window; any free cell of
+        # it will do, the search below moves the tile out of the way.
+        self.route_blank_into(window, avoid=None)
+        self.unlock(self.where[first], self.where[second])
+
+        inside = set(window)
+        start = (self.where[first], self.where[second], self.where[EMPTY_SPACE])
+        parent = {start: None}
+        frontier = [start]
+        found = None
+        while found is None:
+            if not frontier:
+                raise RuntimeError("The last two tiles cannot be placed in the window.")
+            following = []
+            for state in frontier:
+                first_cell, second_cell, blank = state
+                for target in self.neighbors[blank]:
+                    if target not in inside:
+                        continue
+                    if target == first_cell:
+                        child = (blank, second_cell, target)
+                    elif target == second_cell:
+                        child = (first_cell, blank, target)
+                    else:
+                        child = (first_cell, second_cell, target)
+                    if child not in parent:
+                        parent[child] = state
+                        following.append(child)
+                        if child[0] == a and child[1] == b:
+                            found = child
+            frontier = following
+        route = []
+        while parent[found] is not None:
+            route.append(found[2])
+            found = parent[found]
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def solve_row(self, k):
+        """Put row `k` in place, from column `k` to the right edge."""
+        size = self.size
+        start = k * size
+        for col in range(k, size - 2):
+            self.place(start + col + 1, start + col, rows_first=False)
+            self.lock(start + col)
+        a, b = start + size - 2, start + size - 1  # the last two cells
+        window = [a, b] + [b + row * size - col for row in (1, 2) for col in (2, 1, 0)]
+        self.place_pair(a, b, window, rows_first=False)
+        self.lock(a, b)
+
+    def solve_column(self, k):
+        """Put column `k` in place, from row `k + 1` to the bottom edge."""
+        size = self.size
+        for row in range(k + 1, size - 2):
+            cell = row * size + k
+            self.place(cell + 1, cell, rows_first=True)
+            self.lock(cell)
+        a, b = (size - 2) * size + k, (size - 1) * size + k  # the last two cells
+        window = [a, b] + [b - row * size + col for col in (1, 2) for row in (2, 1, 0)]
+        self.place_pair(a, b, window, rows_first=True)
+        self.lock(a, b)
+
+    def solve_corner(self):
+        """Solve the remaining bottom-right 3x3 block optimally."""
+        size = self.size
+        first = size - CORNER
+        cells = [(first + i) * size + first + j for i in range(CORNER) for j in range(CORNER)]
+        # Relabel the block as an 8-puzzle: its k-th cell's tile becomes k + 1.
+        label = {cell + 1: k + 1 for k, cell in enumerate(cells[:-1])}
+        label[EMPTY_SPACE] = EMPTY_SPACE
+        moves, _ = ida_star([label[self.tiles[cell]] for cell in cells], CORNER)
+        for move in moves:
+            d_row, d_col = BLANK_OFFSETS[move]
+            self.slide(self.where[EMPTY_SPACE] + d_row * size + d_col)
+
+
+def _directions(start, path, size):
+    """Convert a list of cells visited by the empty space into directions."""
+    by_offset = {d_row * size + d_col: move for move, (d_row, d_col) in BLANK_OFFSETS.items()}
+    moves = []
+    for cell in path:
+        moves.append(by_offset[cell - start])
+        start = cell
+    return moves
+
+
+def shorten(tiles, size, path):
+    """
+    Remove redundant moves from a path of the empty space.
+
+    The board is replayed while keeping a hash of every state on the
+    current path. Returning to a recorded state cuts the loop since it was
+    first seen; reaching a state one move away from a recorded state earlier
+    than the previous one replaces the detour with that single move. A
+    state's hash is the XOR of one key per (tile, cell) pair, updated in O(1)
+    per move as in Zobrist hashing; the keys are Python's hash of (tile,
+    cell, salt) rather than a random table, which would need size**4 entries.
+
+    Returns:
+        list: the shortened list of cells visited by the empty space.
+    """
+    tiles = list(tiles)
+    neighbors = [tuple(target for target, _ in moves) for moves in get_tables(size)[0]]
+
+    def key(tile, cell):
+        return hash((tile, cell, 0x5bd1e995))
+
+    blank = tiles.index(EMPTY_SPACE)
+    state = 0
+    for cell, tile in enumerate(tiles):
+        state ^= key(tile, cell)
+    stack = [(state, blank)]
+    index = {state: 0}
+    for target in path:
+        tile = tiles[target]
+        state ^= key(tile, target) ^ key(tile, blank) ^ key(EMPTY_SPACE, blank) ^ key(EMPTY_SPACE, target)
+        tiles[blank], tiles[target] = tile, EMPTY_SPACE
+        blank = target
+
+        earlier = index.get(state)
+        if earlier is None:
+            # Is an earlier state one move away from this one?
+            for cell in neighbors[blank]:
+                other = tiles[cell]
+                neighbor = state ^ key(other, cell) ^ key(other, blank) \
+                    ^ key(EMPTY_SPACE, blank) ^ key(EMPTY_SPACE, cell)
+                position = index.get(neighbor)
+                if position is not None and position < len(stack) - 1 \
+                        and (earlier is None or position < earlier):
+                    earlier = position
+            if earlier is not None:
+                earlier += 1  # keep the neighbour, then step to this state
+        if earlier is not None:
+            for old, _ in stack[earlier:]:
+                del index[old]
+            del stack[earlier:]
+        index[state] = len(stack)
+        stack.append((state, blank))
+    return [cell for _, cell in stack[1:]]
+
+
+def solve_large(tiles, size, optimize=True):
+    """
+    Solve a flat board of any size constructively.
+
+    Args:
+        tiles: flat sequence of the board, row by row, 0 for the empty space
+        size: width of the board
+        optimize: remove redundant moves with shorten()
+
+    Returns:
+        list: directions ('left', 'right', 'up', 'down') of the tile slides.
+
+    Raises:
+        ValueError: if the puzzle cannot be solved.
+    """
+    if not is_solvable(tiles, size):
+        raise ValueError("The puzzle is not solvable.")
+    if size < MIN_CONSTRUCTIVE_SIZE:
+        return ida_star(tiles, size)[0]
+    board = _Board(tiles, size)
+    for k in range(size - CORNER):
+        board.solve_row(k)
+        board.solve_column(k)
+    board.solve_corner()
+    start = list(tiles).index(EMPTY_SPACE)
+    path = board.path
+    if optimize:
+        shortened = shorten(tiles, size, path)
+        # A hash collision could only make the shortened path wrong; keep
+        # the original one unless it is legal and ends on the solved board.
+        if _replay(tiles, size, shortened) == board.tiles:
+            path = shortened
+    return _directions(start, path, size)
+
+
+def _replay(tiles, size, path):
+    """The board at the end of `path`, or None if a step is not a move."""
+    neighbors = [tuple(target for target, _ in moves) for moves in get_tables(size)[0]]
+    tiles = list(tiles)
+    blank = tiles.index(EMPTY_SPACE)
+    for target in path:
+        if target not in neighbors[blank]:
+            return None
+        tiles[blank], tiles[target] = tiles[target], EMPTY_SPACE
+        blank = target
+    return tiles
+
+
+def solve_large_puzzle(puzzle, optimize=True):
+    """Solve a list-of-lists puzzle with solve_large()."""
+    return solve_large([tile for row in puzzle for tile in row], len(puzzle), optimize)
@@ -0,0 +1,220 @@
+"""
+Compact binary logs of puzzle sessions and a batch replay verifier.
+
+Each finished game is appended to a log file as one record:
+
+    header   struct '<4sBBII': magic b'SPML', version, board size,
+             reported move count, recorded move count
+    board    size * size bytes, the initial board row by row
+    moves    2 bits per move, four moves per byte, first move in the low bits
+
+Move codes are the positions of the directions in puzzle_batch.MOVES
+('left', 'right', 'up', 'down', the direction the tile slides). A 3x3 game
+of 100 moves takes 48 bytes.
+
+The verifier streams records from any number of files, groups them into
+batches of boards of the same size and of move counts within a factor of
+two, and replays each batch with puzzle_batch.apply_moves, which applies
+one move to every board of the batch at once. Moves are padded to the
+longest record of a batch, so padding at most doubles the moves held. A
+record passes when every move is legal, the final board is solved and the
+reported move count matches the moves recorded.
+
+Usage:
+    python move_log.py verify sessions.sml [more.sml ...]
+"""
+
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+
+import puzzle_batch
+from puzzle_solver import goal_state
+
+MAGIC = b'SPML'
+VERSION = 1
+HEADER = struct.Struct('<4sBBII')
+BATCH_SIZE = 4096
+
+CODES = {direction: code for code, direction in enumerate(puzzle_batch.MOVES)}
+
+
+class MoveLog:
+    """
+    Moves of one game, packed as they are made.
+
+    Attributes:
+        size: width of the board
+        board: the initial board as bytes
+        count: number of moves recorded
+    """
+
+    __slots__ = ('size', 'board', 'count', '_packed')
+
+    def __init__(self, puzzle):
+        self.size = len(puzzle)
+        self.board = bytes(tile for row in puzzle for tile in row)
+        self.count = 0
+        self._packed = bytearray()
+
+    def record(self, direction):
+        """Record one move, given as the direction the tile slid."""
+        shift = 2 * (self.count & 3)
+        if shift == 0:
+            self._packed.append(CODES[direction])
+        else:
+            self._packed[-1] |= CODES[direction] << shift
+        self.count += 1
+
+    def to_bytes(self, reported=None):
+        """
+        Encode the record.
+
+        Args:
+            reported: the move count announced to the player, defaults to
+                the number of moves recorded
+        """
+        reported = self.count if reported is None else reported
+        return HEADER.pack(MAGIC, VERSION, self.size, reported, self.count) + self.board + self._packed
+
+    def save(self, path, reported=None):
+        """Append the record to a log file."""
+        with open(path, 'ab') as f:
+            f.write(self.to_bytes(reported))
+
+
+def read_logs(f):
+    """
+    Stream the records of an open binary log file.
+
+    Yields:
+        tuple: (size, board bytes, reported, count, packed move bytes)
+
+    Raises:
+        ValueError: on a truncated or corrupt record.
+    """
+    while True:
+        header = f.read(HEADER.size)
+        if not header:
+            return
+        if len(header) != HEADER.size:
+            raise ValueError("truncated record header")
+        magic, version, size, reported, count = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a move log record")
+        board = f.read(size * size)
+        packed = f.read((count + 3) // 4)
+        if len(board) != size * size or len(packed) != (count + 3) // 4:
+            raise ValueError("truncated record")
+        yield size, board, reported, count, packed
+
+
+def _unpack_moves(packed, count, length):
+    """Move codes of one record, padded with NO_MOVE to `length`."""
+    codes = np.full(length, puzzle_batch.NO_MOVE, dtype=np.uint8)
+    raw = np.frombuffer(packed, dtype=np.uint8)
+    codes[:count] = ((raw[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).ravel()[:count]
+    return codes
+
+
+def verify_batch(size, records):
+    """
+    Replay records of one board size together.
+
+    Args:
+        size: width of the boards
+        records: list of (board, reported, count, packed) tuples
+
+    Returns:
+        list: one status per record, 'ok', 'invalid board', 'illegal move',
+        'not solved' or 'count mismatch'.
+    """
+    n = size * size
+    length = max(count for _, _, count, _ in records)
+    boards = np.frombuffer(b''.join(board for board, _, _, _ in records), dtype=np.uint8).reshape(-1, n).copy()
+    codes = np.stack([_unpack_moves(packed, count, length) for _, _, count, packed in records])
+    valid = (np.sort(boards, axis=1) == np.arange(n, dtype=np.uint8)).all(axis=1)
+    boards[~valid] = np.array(goal_state(size), dtype=np.uint8)  # keep the kernel on permutations
+    legal = puzzle_batch.apply_moves(boards, size, codes)
+    solved = puzzle_batch.is_solved(boards, size)
+    statuses = []
+    for k, (_, reported, count, _) in enumerate(records):
+        if not valid[k]:
+            statuses.append('invalid board')
+        elif not legal[k]:
+            statuses.append('illegal move')
+        elif not solved[k]:
+            statuses.append('not solved')
+        elif reported != count:
+            statuses.append('count mismatch')
+        else:
+            statuses.append('ok')
+    return statuses
+
+
+def verify(records, batch_size=BATCH_SIZE):
+    """
+    Verify a stream of records in batches.
+
+    Args:
+        records: iterable of (size, board, reported, count, packed), as
+            produced by read_logs()
+
+    Yields:
+        tuple: (record number, size, count, status) in input order within
+        each batch; records of different batches may come out interleaved.
+    """
+    # Records are batched by size and by the bit length of their move count,
+    # so no record is padded to more than twice its own moves.
+    pending = {}  # (size, bit length of count) -> list of (number, record)
+
+    def flush(key):
+        batch = pending.pop(key)
+        statuses = verify_batch(key[0], [record for _, record in batch])
+        for (number, record), status in zip(batch, statuses):
+            yield number, key[0], record[2], status
+
+    for number, (size, *record) in enumerate(records):
+        key = size, record[2].bit_length()
+        pending.setdefault(key, []).append((number, record))
+        if len(pending[key]) >= batch_size:
+            yield from flush(key)
+    for key in list(pending):
+        yield from flush(key)
+
+
+def _stream_files(paths):
+    for path in paths:
+        with open(path, 'rb') as f:
+            yield from read_logs(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify puzzle move logs.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    verify_parser = subparsers.add_parser('verify', help="replay logs and check every record")
+    verify_parser.add_argument('paths', nargs='+')
+    verify_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records = moves = 0
+    failures = {}
+    for number, size, count, status in verify(_stream_files(args.paths), args.batch_size):
+        records += 1
+        moves += count
+        if status != 'ok':
+            failures[status] = failures.get(status, 0) + 1
+            print(f"record {number}: {size}x{size}, {count} moves: {status}")
+    elapsed = time.perf_counter() - started
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(failures.items()))
+    print(f"{records} records, {moves} moves in {elapsed:.2f}s "
+          f"({moves / elapsed if elapsed else 0:,.0f} moves/s): {summary or 'all ok'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Additive disjoint pattern databases for the 15- and 24-puzzle.
+
+A pattern database stores, for every placement of a group of tiles, the
+number of moves of those tiles needed to bring them home. The tiles are
+split into disjoint groups and every move is charged to the group of the
+tile that slides, so the lookups of all groups can be added together and
+still never overestimate the real distance.
+
+The tables are built offline by a breadth-first search that runs across
+several processes, each one scanning a slice of the table for the current
+layer and writing the next one straight into a memory-mapped file. The
+placements of a layer are ranked and unranked as NumPy arrays, CHUNK at a
+time: a 4x4 six-tile table (5.8M entries) takes about 30 seconds on one
+process and a 5x5 one (127.5M entries) about twenty times that. At runtime
+the files are opened with mmap, so loading is instant and worker processes
+share the same pages.
+
+Build the default tables with:
+    python pattern_database.py 4
+    python pattern_database.py 5 --processes 8
+"""
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from puzzle_solver import ManhattanHeuristic, get_tables
+
+MAGIC = b'SPDB'
+HEADER_SIZE = 32
+UNSEEN = 0xFF
+CHUNK = 1 << 16  # placements expanded together by a builder process
+
+# Default splits of the tiles into disjoint patterns.
+PATTERNS = {
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 3, 6, 7, 8), (4, 5, 9, 10, 14, 15),
+        (11, 12, 16, 17, 21, 22), (13, 18, 19, 20, 23, 24)),
+}
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb')
+
+# Table shared by the builder's worker processes.
+_table = None
+_job = None
+
+
+def table_length(cells, count):
+    """Number of placements of `count` distinct tiles on `cells` cells."""
+    length = 1
+    for i in range(count):
+        length *= cells - i
+    return length
+
+
+def rank(positions, cells):
+    """
+    Map distinct cell positions to a unique index in [0, table_length()).
+
+    Each position is encoded by how many still-unused cells lie below it,
+    which gives a mixed-radix number with bases cells, cells - 1, ...
+    """
+    index = 0
+    for i, position in enumerate(positions):
+        smaller = 0
+        for previous in positions[:i]:
+            if previous < position:
+                smaller += 1
+        index = index * (cells - i) + position - smaller
+    return index
+
+
+def unrank(index, cells, count):
+    """Inverse of rank(): return the list of positions for an index."""
+    digits = []
+    for i in range(count - 1, -1, -1):
+        index, digit = divmod(index, cells - i)
+        digits.append(digit)
+    digits.reverse()
+    free = list(range(cells))
+    return [free.pop(digit) for digit in digits]
+
+
+def rank_many(positions, cells):
+    """rank() of every row of an (n, count) array of positions."""
+    index = np.zeros(len(positions), dtype=np.int64)
+    for i in range(positions.shape[1]):
+        smaller = (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+        index = index * (cells - i) + positions[:, i] - smaller
+    return index
+
+
+def unrank_many(indices, cells, count):
+    """unrank() of an array of indices, as an (n, count) array of positions."""
+    digits = np.empty((len(indices), count), dtype=np.int64)
+    indices = np.array(indices, dtype=np.int64)
+    for i in range(count - 1, -1, -1):
+        indices, digits[:, i] = np.divmod(indices, cells - i)
+    positions = digits
+    for i in range(1, count):
+        # The digit counts the unused cells below; skip the used ones, lowest first.
+        for used in np.sort(positions[:, :i], axis=1).T:
+            positions[:, i] += used <= positions[:, i]
+    return positions
+
+
+def database_path(size, pattern, directory=DEFAULT_DIRECTORY):
+    """Return the file name used for the database of a pattern."""
+    name = '-'.join(str(tile) for tile in pattern)
+    return os.path.join(directory, f'{size}x{size}-{name}.pdb')
+
+
+def _open_table(path, access):
+    with open(path, 'r+b' if access == mmap.ACCESS_WRITE else 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=access)
+
+
+def _init_worker(path, size, count):
+    """Pool initializer: map the table being built into the worker."""
+    global _table, _job
+    _table = _open_table(path, mmap.ACCESS_WRITE)
+    # Neighbouring cells of each cell, -1 where a side has none.
+    neighbors = np.full((size * size, 4), -1, dtype=np.int64)
+    for cell, moves in enumerate(get_tables(size)[0]):
+        neighbors[cell, :len(moves)] = [target for target, _ in moves]
+    _job = (size, count, neighbors)
+
+
+def _expand_slice(args):
+    """
+    Expand every state of one depth found in a slice of the table.
+
+    The pattern tiles are the only obstacles: a tile may step onto any
+    neighbouring cell not held by another pattern tile, which relaxes the
+    real puzzle (where that cell must be the empty space) and keeps the
+    estimate admissible. Newly reached states are written straight into the
+    shared table; two workers reaching the same state write the same value.
+
+    Returns:
+        int: number of states given the next depth.
+    """
+    start, stop, depth = args
+    size, count, neighbors = _job
+    cells = size * size
+    table = np.frombuffer(_table, dtype=np.uint8)[HEADER_SIZE:]
+    found = 0
+    for first in range(start, stop, CHUNK):
+        layer = np.flatnonzero(table[first:min(first + CHUNK, stop)] == depth) + first
+        if not len(layer):
+            continue
+        positions = unrank_many(layer, cells, count)
+        for i in range(count):
+            for side in range(4):
+                targets = neighbors[positions[:, i], side]
+                free = (targets >= 0) & ~(positions == targets[:, None]).any(axis=1)
+                children = positions[free]
+                children[:, i] = targets[free]
+                children = rank_many(children, cells)
+                children = np.unique(children[table[children] == UNSEEN])
+                table[children] = depth + 1
+                found += len(children)
+    return found
+
+
+def build_database(size, pattern, path, processes=None, verbose=True):
+    """
+    Build the pattern database of one tile group and write it to `path`.
+
+    The file is a small header (magic, size, tile count and tiles) followed
+    by one byte per placement of the pattern tiles holding its distance.
+
+    Args:
+        size: width of the board
+        pattern: tuple of the tiles in the group
+        path: output file
+        processes: number of worker processes, defaults to the CPU count
+        verbose: print progress for every BFS layer
+    """
+    cells = size * size
+    count = len(pattern)
+    length = table_length(cells, count)
+    header = MAGIC + bytes([size, count]) + bytes(pattern)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        block = bytes([UNSEEN]) * (1 << 20)
+        remaining = length
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+
+    table = _open_table(path, mmap.ACCESS_WRITE)
+    goal = get_tables(size)[2:]
+    home = [goal[0][tile] * size + goal[1][tile] for tile in pattern]
+    table[HEADER_SIZE + rank(home, cells)] = 0
+
+    processes = processes or os.cpu_count() or 1
+    step = max(1, -(-length // (processes * 16)))
+    slices = [(start, min(start + step, length)) for start in range(0, length, step)]
+    depth, found, total = 0, 1, 1
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes, _init_worker, (path, size, count)) as pool:
+        while found:
+            found = sum(pool.imap_unordered(_expand_slice, [(a, b, depth) for a, b in slices]))
+            total += found
+            depth += 1
+            if verbose:
+                print(f"{os.path.basename(path)}: depth {depth:3d}  "
+                      f"{found:10d} new  {total:10d}/{length} "
+                      f"({time.perf_counter() - started:.1f}s)")
+    table.flush()
+    table.close()
+
+
+class PatternDatabase:
+    """A pattern database file opened read-only through mmap."""
+
+    def __init__(self, path):
+        self.table = _open_table(path, mmap.ACCESS_READ)
+        if self.table[:4] != MAGIC:
+            raise ValueError(f"{path} is not a pattern database.")
+        self.size = self.table[4]
+        count = self.table[5]
+        self.pattern = tuple(self.table[6:6 + count])
+        self.cells = self.size * self.size
+        if len(self.table) != HEADER_SIZE + table_length(self.cells, count):
+            raise ValueError(f"{path} is truncated.")
+
+    def lookup(self, positions):
+        """Distance of the pattern tiles placed on `positions`."""
+        return self.table[HEADER_SIZE + rank(positions, self.cells)]
+
+
+class PatternDatabaseHeuristic:
+    """
+    Sum of the lookups of disjoint pattern databases.
+
+    Implements the same reset()/move() interface as
+    puzzle_solver.ManhattanHeuristic so it can be passed to ida_star().
+    Only the database owning the moving tile is consulted on a move.
+    """
+
+    def __init__(self, databases):
+        self.databases = list(databases)
+        self.size = self.databases[0].size
+        self.owner = {}
+        for i, database in enumerate(self.databases):
+            for slot, tile in enumerate(database.pattern):
+                self.owner[tile] = (i, slot)
+        if len(self.owner) != self.size * self.size - 1:
+            raise ValueError("The patterns must cover every tile exactly once.")
+        self.positions = []
+        self.values = []
+
+    def reset(self, tiles):
+        """Start tracking `tiles` and return its estimate."""
+        where = {tile: cell for cell, tile in enumerate(tiles)}
+        self.positions = [[where[tile] for tile in database.pattern] for database in self.databases]
+        self.values = [database.lookup(positions)
+                       for database, positions in zip(self.databases, self.positions)]
+        return sum(self.values)
+
+    def move(self, tile, source, target):
+        """Slide `tile` from cell `source` to the empty cell `target`."""
+        i, slot = self.owner[tile]
+        positions = self.positions[i]
+        positions[slot] = target
+        value = self.databases[i].lookup(positions)
+        delta = value - self.values[i]
+        self.values[i] = value
+        return delta
+
+
+def load_heuristic(size, directory=DEFAULT_DIRECTORY, patterns=None):
+    """
+    Open the pattern databases of a board size as a heuristic.
+
+    Raises:
+        FileNotFoundError: if a database has not been built yet.
+    """
+    patterns = patterns or PATTERNS[size]
+    return PatternDatabaseHeuristic(
+        PatternDatabase(database_path(size, pattern, directory)) for pattern in patterns)
+
+
+def make_heuristic(size, kind='manhattan', directory=DEFAULT_DIRECTORY):
+    """
+    Return a heuristic for ida_star() by name.
+
+    Args:
+        size: width of the board
+        kind: 'manhattan' for Manhattan distance plus linear conflicts,
+            'pdb' for the additive pattern databases
+        directory: where the pattern database files live
+    """
+    if kind == 'manhattan':
+        return ManhattanHeuristic(size)
+    if kind == 'pdb':
+        return load_heuristic(size, directory)
+    raise ValueError(f"Unknown heuristic: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build additive pattern databases.")
+    parser.add_argument('size', type=int, choices=sorted(PATTERNS))
+    parser.add_argument('--processes', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY,
+                        help="output directory for the .pdb files")
+    args = parser.parse_args()
+    for pattern in PATTERNS[args.size]:
+        build_database(args.size, pattern, database_path(args.size, pattern, args.directory),
+                       args.processes)
+
+
+if __name__ == "__main__":
+    main()
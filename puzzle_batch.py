@@ -0,0 +1,194 @@
+"""
+NumPy batch engine for sliding-puzzle boards.
+
+Boards are processed in bulk as a (batch, size * size) uint8 array, one
+flat board per row with 0 for the empty space, the same layout as the flat
+lists used by puzzle_solver.py. Every function works on a whole batch with
+array operations instead of looping over boards in Python.
+
+Requires NumPy.
+"""
+
+import numpy as np
+
+from puzzle_solver import BLANK_OFFSETS, get_tables, goal_state
+
+# Move codes used by apply_moves: the index of a direction in MOVES, or
+# NO_MOVE to pad move sequences of different lengths.
+MOVES = tuple(BLANK_OFFSETS)
+NO_MOVE = len(MOVES)
+
+_tables_cache = {}
+_move_tables_cache = {}
+
+
+def _tables(size):
+    """Per-size arrays: goal row, Manhattan table and padded neighbor table."""
+    if size not in _tables_cache:
+        neighbors, distance, _, _ = get_tables(size)
+        n = size * size
+        goal = np.array(goal_state(size), dtype=np.uint8)
+        manhattan = np.array(distance, dtype=np.uint16)
+        # targets[cell, k] is the k-th cell the empty space can move to, or -1.
+        targets = np.full((n, len(BLANK_OFFSETS)), -1, dtype=np.int64)
+        for cell, moves in enumerate(neighbors):
+            for k, (target, _) in enumerate(moves):
+                targets[cell, k] = target
+        _tables_cache[size] = (goal, manhattan, targets)
+    return _tables_cache[size]
+
+
+def from_puzzles(puzzles):
+    """Stack list-of-lists boards into a (batch, n * n) uint8 array."""
+    return np.array([[tile for row in puzzle for tile in row] for puzzle in puzzles], dtype=np.uint8)
+
+
+def to_puzzles(boards, size):
+    """Convert a batch back into a list of list-of-lists boards."""
+    return boards.reshape(-1, size, size).tolist()
+
+
+def solved_boards(batch, size):
+    """Return `batch` copies of the solved board."""
+    return np.tile(_tables(size)[0], (batch, 1))
+
+
+def blank_positions(boards):
+    """Index of the empty cell on every board."""
+    return np.argmin(boards, axis=1)
+
+
+def inversion_parity(boards):
+    """
+    Parity (0 or 1) of the inversions between numbered tiles of every board.
+
+    Inversions are counted with one vectorized comparison per column. The
+    empty space (0) is smaller than every tile, so it adds exactly one
+    inversion per tile in front of it, i.e. its index, which is removed.
+    """
+    n = boards.shape[1]
+    count = np.zeros(len(boards), dtype=np.int64)
+    for i in range(n - 1):
+        count += np.count_nonzero(boards[:, i, None] > boards[:, i + 1:], axis=1)
+    return ((count - blank_positions(boards)) & 1).astype(np.uint8)
+
+
+def is_solvable(boards, size):
+    """Boolean mask of the solvable boards, matching puzzle_solver.is_solvable."""
+    parity = inversion_parity(boards)
+    if size % 2 != 0:
+        return parity == 0
+    blank_row = size - blank_positions(boards) // size
+    return ((parity + blank_row) & 1) == 1
+
+
+def is_solved(boards, size):
+    """Boolean mask of the boards in the goal state."""
+    return np.all(boards == _tables(size)[0], axis=1)
+
+
+def manhattan(boards, size):
+    """Manhattan distance of every board."""
+    table = _tables(size)[1]
+    return table[boards, np.arange(boards.shape[1])].sum(axis=1, dtype=np.int64)
+
+
+def misplaced(boards, size):
+    """Number of numbered tiles that are not on their goal cell."""
+    goal = _tables(size)[0]
+    return np.count_nonzero((boards != goal) & (boards != 0), axis=1)
+
+
+def random_boards(batch, size, rng=None):
+    """
+    Return `batch` uniformly random solvable boards.
+
+    Unsolvable draws are repaired by swapping their first two numbered
+    tiles, as puzzle_generator.generate_solvable_tiles() does.
+    """
+    rng = rng or np.random.default_rng()
+    n = size * size
+    boards = rng.permuted(np.tile(np.arange(n, dtype=np.uint8), (batch, 1)), axis=1)
+    bad = np.flatnonzero(~is_solvable(boards, size))
+    if len(bad):
+        # The first two numbered tiles are in columns 0-1, 0-2 or 1-2.
+        first = (boards[bad, 0] == 0).astype(np.int64)
+        second = np.where(boards[bad, first + 1] == 0, first + 2, first + 1)
+        a, b = boards[bad, first], boards[bad, second]
+        boards[bad, first], boards[bad, second] = b, a
+    return boards
+
+
+def scramble(boards, size, steps, rng=None):
+    """
+    Apply a random walk of `steps` moves to every board, in place.
+
+    Each step moves the empty space of every board once, to a uniformly
+    chosen neighbor other than the cell it just left.
+
+    Returns:
+        the boards array, for chaining.
+    """
+    rng = rng or np.random.default_rng()
+    targets = _tables(size)[2]
+    rows = np.arange(len(boards))
+    blank = blank_positions(boards)
+    previous = np.full(len(boards), -1)
+    for _ in range(steps):
+        candidates = targets[blank]
+        keys = rng.random(candidates.shape)
+        keys[(candidates < 0) | (candidates == previous[:, None])] = -1
+        target = candidates[rows, np.argmax(keys, axis=1)]
+        boards[rows, blank] = boards[rows, target]
+        boards[rows, target] = 0
+        previous, blank = blank, target
+    return boards
+
+
+def _move_table(size):
+    """move_table[cell, code] is the cell the empty space moves to, or -1 if illegal."""
+    if size not in _move_tables_cache:
+        n = size * size
+        table = np.full((n, NO_MOVE + 1), -1, dtype=np.int64)
+        for cell in range(n):
+            row, col = divmod(cell, size)
+            for code, direction in enumerate(MOVES):
+                d_row, d_col = BLANK_OFFSETS[direction]
+                if 0 <= row + d_row < size and 0 <= col + d_col < size:
+                    table[cell, code] = cell + d_row * size + d_col
+            table[cell, NO_MOVE] = cell
+        _move_tables_cache[size] = table
+    return _move_tables_cache[size]
+
+
+def apply_moves(boards, size, codes):
+    """
+    Apply one sequence of moves per board, in place.
+
+    Move k of every board is applied in a single step across the batch, so
+    the cost per move shrinks with the batch size. An illegal move is
+    skipped and marks the board.
+
+    Args:
+        boards: (batch, size * size) uint8 array
+        size: width of the boards
+        codes: (batch, length) array of move codes, indexes into MOVES,
+            padded with NO_MOVE
+
+    Returns:
+        bool array: True for the boards whose moves were all legal.
+    """
+    table = _move_table(size)
+    rows = np.arange(len(boards))
+    blank = blank_positions(boards)
+    legal = np.ones(len(boards), dtype=bool)
+    for step in range(codes.shape[1]):
+        target = table[blank, codes[:, step]]
+        illegal = target < 0
+        if illegal.any():
+            legal &= ~illegal
+            target = np.where(illegal, blank, target)
+        boards[rows, blank] = boards[rows, target]
+        boards[rows, target] = 0
+        blank = target
+    return legal
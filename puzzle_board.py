@@ -0,0 +1,141 @@
+"""
+Headless model of one sliding-puzzle board.
+
+PuzzleBoard holds the state that GUI_sliding_puzzle.py used to keep in
+module globals, without any turtle objects, so games can be simulated,
+benchmarked and run by the thousand in one process. Next to the flat
+board it keeps the position of every tile and the number of tiles out of
+place, which makes tile_position(), empty_position and is_solved() O(1).
+
+Like PackedState it iterates as rows of tiles, so print_puzzle(), the
+solvers and the hint cache accept it in place of a list-of-lists puzzle.
+"""
+
+from puzzle_solver import BLANK_OFFSETS, EMPTY_SPACE, get_tables, goal_state
+
+
+class PuzzleBoard:
+    """
+    A mutable sliding-puzzle board.
+
+    Attributes:
+        size: width of the board
+        tiles: flat list of tiles, row by row, EMPTY_SPACE for the empty cell
+        positions: cell of each tile, indexed by tile number
+        misplaced: number of tiles (the empty space included) off their goal cell
+    """
+
+    __slots__ = ('size', 'tiles', 'positions', 'misplaced', '_neighbors')
+
+    def __init__(self, tiles, size):
+        self.size = size
+        self.tiles = list(tiles)
+        self.positions = [0] * len(self.tiles)
+        for cell, tile in enumerate(self.tiles):
+            self.positions[tile] = cell
+        self.misplaced = sum(1 for cell, tile in enumerate(self.tiles) if not self._home(tile, cell))
+        self._neighbors = get_tables(size)[0]
+
+    @classmethod
+    def from_puzzle(cls, puzzle):
+        """Create a board from a list-of-lists puzzle."""
+        return cls([tile for row in puzzle for tile in row], len(puzzle))
+
+    @classmethod
+    def solved(cls, size):
+        """Create the solved board of the given size."""
+        return cls(goal_state(size), size)
+
+    def _home(self, tile, cell):
+        """Whether `tile` is on its goal cell."""
+        if tile == EMPTY_SPACE:
+            return cell == len(self.tiles) - 1
+        return cell == tile - 1
+
+    def to_puzzle(self):
+        """Return the board in the list-of-lists format."""
+        tiles, size = self.tiles, self.size
+        return [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+    def copy(self):
+        return PuzzleBoard(self.tiles, self.size)
+
+    def tile_at(self, row, col):
+        """Return the tile on a cell."""
+        return self.tiles[row * self.size + col]
+
+    def tile_position(self, number):
+        """Row and column of the tile `number`."""
+        return divmod(self.positions[number], self.size)
+
+    @property
+    def empty_position(self):
+        """Row and column of the empty space."""
+        return divmod(self.positions[EMPTY_SPACE], self.size)
+
+    def is_adjacent(self, row, col):
+        """Check if a cell is next to the empty space."""
+        empty_row, empty_col = self.empty_position
+        return abs(row - empty_row) + abs(col - empty_col) == 1
+
+    def _swap(self, target):
+        """Slide the tile on cell `target` into the empty space."""
+        tiles, positions = self.tiles, self.positions
+        blank = positions[EMPTY_SPACE]
+        tile = tiles[target]
+        self.misplaced += (self._home(tile, target) + self._home(EMPTY_SPACE, blank)
+                           - self._home(tile, blank) - self._home(EMPTY_SPACE, target))
+        tiles[blank], positions[tile] = tile, blank
+        tiles[target], positions[EMPTY_SPACE] = EMPTY_SPACE, target
+
+    def slide(self, row, col):
+        """
+        Slide the tile on (row, col) into the empty space.
+
+        Returns:
+            bool: True if the move was made, False if the cell is not next
+            to the empty space.
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size) or not self.is_adjacent(row, col):
+            return False
+        self._swap(row * self.size + col)
+        return True
+
+    def move(self, direction):
+        """
+        Slide the tile next to the empty space in `direction`.
+
+        Args:
+            direction: 'left', 'right', 'up' or 'down', as in puzzle_solver
+
+        Returns:
+            bool: True if the move was made, False if it is not possible.
+        """
+        d_row, d_col = BLANK_OFFSETS[direction]
+        empty_row, empty_col = self.empty_position
+        return self.slide(empty_row + d_row, empty_col + d_col)
+
+    def valid_moves(self):
+        """Directions that are possible from the current state."""
+        return tuple(direction for _, direction in self._neighbors[self.positions[EMPTY_SPACE]])
+
+    def is_solved(self):
+        """Check if the puzzle is solved."""
+        return self.misplaced == 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_puzzle())
+
+    def __getitem__(self, row):
+        return self.tiles[row * self.size:(row + 1) * self.size]
+
+    def __eq__(self, other):
+        if not isinstance(other, PuzzleBoard):
+            return NotImplemented
+        return self.tiles == other.tiles
+
+    def __repr__(self):
+        return f"PuzzleBoard.from_puzzle({self.to_puzzle()!r})"
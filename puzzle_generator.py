@@ -0,0 +1,138 @@
+"""
+Puzzle generation for boards of any size, optionally at a target difficulty.
+
+A random permutation is solvable exactly half of the time. Instead of
+drawing again until one passes, an unsolvable draw is repaired in one step
+by swapping two numbered tiles: that flips the inversion parity without
+moving the empty space. The swap pairs every unsolvable board with exactly
+one solvable board, so the result is still uniform over solvable boards.
+
+Boards at a given optimal distance k come from the exact distance table for
+3x3, and from heuristic-guided random walks checked by the solver for
+larger boards.
+"""
+
+import random
+
+from eight_puzzle_table import random_board_at_distance
+from puzzle_solver import (EMPTY_SPACE, ManhattanHeuristic, get_tables, goal_state,
+                           ida_star, is_solvable)
+
+# Largest size for which generate_puzzle() proves the distance with IDA*.
+MAX_EXACT_SIZE = 4
+
+
+def generate_solvable_tiles(size, rng=random):
+    """
+    Return a uniformly random solvable board as a flat list.
+
+    Args:
+        size: width of the board
+        rng: source of randomness, the random module or a random.Random
+    """
+    tiles = list(range(size * size))
+    rng.shuffle(tiles)
+    if not is_solvable(tiles, size):
+        # Swap the first two numbered tiles.
+        i = 0 if tiles[0] != EMPTY_SPACE else 1
+        j = i + 1 if tiles[i + 1] != EMPTY_SPACE else i + 2
+        tiles[i], tiles[j] = tiles[j], tiles[i]
+    return tiles
+
+
+def generate_solvable_puzzle(size, rng=random):
+    """Return a uniformly random solvable board in the list-of-lists format."""
+    return _to_puzzle(generate_solvable_tiles(size, rng), size)
+
+
+def _to_puzzle(tiles, size):
+    return [list(tiles[i * size:(i + 1) * size]) for i in range(size)]
+
+
+def _solver_heuristic(size):
+    """Pattern databases when they have been built, Manhattan otherwise."""
+    try:
+        from pattern_database import load_heuristic
+        return load_heuristic(size)
+    except (KeyError, OSError):
+        return ManhattanHeuristic(size)
+
+
+def walk_from_goal(size, steps, rng=random):
+    """
+    Walk `steps` moves away from the solved board, never undoing a move and
+    preferring moves that raise the Manhattan plus linear-conflict estimate.
+
+    The optimal distance of the result lies between its estimate and
+    `steps`, so when the estimate reaches `steps` the distance is exact.
+
+    Returns:
+        tuple: (tiles, estimate)
+    """
+    heuristic = ManhattanHeuristic(size)
+    neighbors = get_tables(size)[0]
+    tiles = list(goal_state(size))
+    h = heuristic.reset(tiles)
+    blank, previous = len(tiles) - 1, None
+    for _ in range(steps):
+        rising, others = [], []
+        for target, _ in neighbors[blank]:
+            if target == previous:
+                continue
+            tile = tiles[target]
+            delta = heuristic.move(tile, target, blank)
+            heuristic.move(tile, blank, target)
+            (rising if delta > 0 else others).append((target, delta))
+        target, delta = rng.choice(rising or others)
+        tile = tiles[target]
+        heuristic.move(tile, target, blank)
+        tiles[blank], tiles[target] = tile, EMPTY_SPACE
+        h += delta
+        blank, previous = target, blank
+    return tiles, h
+
+
+def _advance(tiles, size, moves):
+    """Apply a list of moves to a flat board in place."""
+    neighbors = get_tables(size)[0]
+    blank = tiles.index(EMPTY_SPACE)
+    for move in moves:
+        target = next(target for target, direction in neighbors[blank] if direction == move)
+        tiles[blank], tiles[target] = tiles[target], EMPTY_SPACE
+        blank = target
+
+
+def generate_puzzle(size, distance=None, rng=random):
+    """
+    Generate a solvable puzzle, optionally at a given difficulty.
+
+    Args:
+        size: width of the board
+        distance: length of the optimal solution, or None for a uniformly
+            random board. The distance is exact for 3x3 and 4x4 boards; for
+            larger boards it is only guaranteed to be at most `distance` and
+            at least the Manhattan plus linear-conflict estimate.
+        rng: source of randomness
+
+    Returns:
+        list: the board in the list-of-lists format.
+    """
+    if distance is None:
+        return generate_solvable_puzzle(size, rng)
+    if size == 3:
+        return _to_puzzle(random_board_at_distance(distance, rng), size)
+
+    steps = distance
+    while True:
+        tiles, estimate = walk_from_goal(size, steps, rng)
+        if size > MAX_EXACT_SIZE or estimate == steps == distance:
+            # Bounded by `estimate` from below and by the walk from above;
+            # after a longer walk only the solver gives the exact distance.
+            return _to_puzzle(tiles, size)
+        moves, _ = ida_star(tiles, size, _solver_heuristic(size))
+        if len(moves) >= distance:
+            # Boards along an optimal path are one move closer at each step.
+            _advance(tiles, size, moves[:len(moves) - distance])
+            return _to_puzzle(tiles, size)
+        # The walk doubled back on itself; walk further next time.
+        steps += distance - len(moves)
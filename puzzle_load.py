@@ -0,0 +1,149 @@
+"""
+Load generator for puzzle_server.py.
+
+Opens many concurrent sessions, holds them all open, then has every
+session play random legal moves and times each MOVE round trip. Reports
+the sessions held at once and the p50/p99 move latency.
+
+Usage:
+    python puzzle_load.py --sessions 10000 --moves 20 --serve
+    python puzzle_load.py --host 10.0.0.5 --port 8765 --sessions 2000
+
+--serve starts a server in a subprocess on a free port and stops it at
+the end.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from puzzle_server import DEFAULT_PORT, raise_file_limit
+from puzzle_state import PackedState
+
+CONNECT_CONCURRENCY = 500  # connections being opened at the same time
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzle_server.py')
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(percent / 100 * len(ordered)))]
+
+
+class _Load:
+    """Shared counters of one load run."""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.connected = 0  # sessions that connected or failed to
+        self.held = self.peak = 0
+        self.all_connected = asyncio.Event()
+        self.latencies = []
+        self.errors = []
+
+    def arrived(self):
+        self.connected += 1
+        if self.connected == self.sessions:
+            self.all_connected.set()
+
+
+async def _session(host, port, seed, moves, connect_limit, load):
+    async with connect_limit:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(f"NEW 3 {seed}\n".encode())
+            reply = (await reader.readline()).decode()
+        except OSError as error:
+            load.errors.append(str(error))
+            load.arrived()
+            return
+    if not reply.startswith('BOARD'):
+        load.errors.append(reply.strip() or "connection closed")
+        load.arrived()
+        writer.close()
+        return
+    tiles = [int(tile) for tile in reply.split()[1:]]
+    state = PackedState.from_tiles(tiles, 3)
+    load.held += 1
+    load.peak = max(load.peak, load.held)
+    load.arrived()
+    await load.all_connected.wait()  # start moving once every session is open
+
+    rng = random.Random(seed)
+    try:
+        for _ in range(moves):
+            direction = rng.choice(state.valid_moves())
+            state.move(direction)
+            started = time.perf_counter()
+            writer.write(f"MOVE {direction}\n".encode())
+            reply = await reader.readline()
+            load.latencies.append(time.perf_counter() - started)
+            if not reply.startswith((b'OK', b'SOLVED')):
+                load.errors.append(reply.decode().strip() or "connection closed")
+                break
+        writer.write(b"QUIT\n")
+        await reader.readline()
+    except OSError as error:
+        load.errors.append(str(error))
+    finally:
+        load.held -= 1
+        writer.close()
+
+
+async def run(host, port, sessions, moves, seed=0):
+    """
+    Run the load.
+
+    Returns:
+        tuple: (sessions held at once, move latencies, errors, seconds)
+    """
+    connect_limit = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    load = _Load(sessions)
+    started = time.perf_counter()
+    await asyncio.gather(*(_session(host, port, seed + k, moves, connect_limit, load)
+                           for k in range(sessions)))
+    return load.peak, load.latencies, load.errors, time.perf_counter() - started
+
+
+def _start_server():
+    process = subprocess.Popen([sys.executable, SERVER_PATH, '--port', '0'],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "Serving sliding puzzles on host:port"
+    return process, int(line.rsplit(':', 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test puzzle_server.py.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--moves', type=int, default=20, help="moves per session")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--serve', action='store_true', help="start a local server for the test")
+    args = parser.parse_args()
+    raise_file_limit()
+
+    server = None
+    if args.serve:
+        server, args.port = _start_server()
+    try:
+        held, latencies, errors, elapsed = asyncio.run(
+            run(args.host, args.port, args.sessions, args.moves, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(f"{held} sessions held at once, {len(latencies)} moves in {elapsed:.1f}s "
+          f"({len(latencies) / elapsed:,.0f} moves/s), {len(errors)} errors")
+    if latencies:
+        print(f"move latency p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    if errors:
+        print(f"first error: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
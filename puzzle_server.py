@@ -0,0 +1,263 @@
+"""
+Asyncio TCP server hosting many sliding-puzzle sessions in one process.
+
+Every connection is one session playing one board at a time. The protocol
+is line based, one command per line and one reply line per command:
+
+    NEW [size] [seed]   start a board (size 3 by default)  -> BOARD <tiles>
+    KEYS <4 letters>    bind keys for left, right, up and down   -> OK
+    MOVE <key|dir>      slide a tile, as move_tile() does
+                        -> OK <moves>, SOLVED <moves> or ERR Move not possible
+    VALID               moves possible, as get_valid_moves() does
+                        -> VALID left-a, up-w (just the names without KEYS)
+    BOARD               the board, row by row, 0 for the empty space
+    QUIT                -> BYE, then the server closes the connection
+
+Errors are reported as "ERR <message>". A session keeps only a PackedState,
+its move count and its key bindings. Sessions idle for longer than the
+idle timeout are closed, overlong lines are refused, and a session does not
+read its next command before its last reply has been drained into the
+socket, so a client that stops reading stops being served instead of
+filling the server's memory.
+
+Usage:
+    python puzzle_server.py --port 8765 --idle-timeout 60
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import puzzle_generator
+from puzzle_state import PackedState
+
+DEFAULT_PORT = 8765
+IDLE_TIMEOUT = 60  # seconds
+MAX_LINE = 256  # bytes
+MAX_SESSIONS = 20000
+MAX_SIZE = 15  # largest board a session may ask for
+DIRECTIONS = ('left', 'right', 'up', 'down')
+
+
+class Session:
+    """Compact state of one connection."""
+
+    __slots__ = ('state', 'moves', 'keys', 'last_active')
+
+    def __init__(self):
+        self.state = None
+        self.moves = 0
+        self.keys = None  # key -> direction, as bound by KEYS
+        self.last_active = time.monotonic()
+
+    def new(self, size, seed):
+        rng = random.Random(seed) if seed is not None else random
+        self.state = PackedState.from_puzzle(puzzle_generator.generate_puzzle(size, rng=rng))
+        self.moves = 0
+        return self.board()
+
+    def board(self):
+        return 'BOARD ' + ' '.join(map(str, self.state.to_tiles()))
+
+    def move(self, key):
+        if self.keys is not None and key in self.keys:
+            direction = self.keys[key]
+        elif key in DIRECTIONS:
+            direction = key
+        else:
+            return "ERR Invalid move. Please enter a valid move key."
+        if self.state.is_solved():
+            return f"SOLVED {self.moves}"
+        if not self.state.move(direction):
+            return "ERR Move not possible. Try a different direction."
+        self.moves += 1
+        return f"{'SOLVED' if self.state.is_solved() else 'OK'} {self.moves}"
+
+    def valid(self):
+        moves = self.state.valid_moves()
+        if self.keys is None:
+            return 'VALID ' + ', '.join(moves)
+        names = {direction: key for key, direction in self.keys.items()}
+        return 'VALID ' + ', '.join(f"{move}-{names[move]}" for move in moves)
+
+    def bind(self, letters):
+        letters = letters.lower()
+        if len(letters) != 4 or not letters.isalpha() or len(set(letters)) != 4:
+            return "ERR Please enter 4 unique letters."
+        self.keys = dict(zip(letters, DIRECTIONS))
+        return "OK"
+
+    def handle(self, line):
+        """Return the reply to one command line, or None to close the session."""
+        command, _, argument = line.strip().partition(' ')
+        command = command.upper()
+        argument = argument.strip()
+        if command == 'QUIT':
+            return None
+        if command == 'NEW':
+            fields = argument.split()
+            if len(fields) > 2 or not all(field.isdigit() for field in fields):
+                return "ERR usage: NEW [size] [seed]"
+            size = int(fields[0]) if fields else 3
+            if not 2 <= size <= MAX_SIZE:
+                return f"ERR size must be between 2 and {MAX_SIZE}"
+            return self.new(size, int(fields[1]) if len(fields) > 1 else None)
+        if command == 'KEYS':
+            return self.bind(argument)
+        if self.state is None:
+            return "ERR no board, send NEW first"
+        if command == 'MOVE':
+            return self.move(argument.lower())
+        if command == 'VALID':
+            return self.valid()
+        if command == 'BOARD':
+            return self.board()
+        return f"ERR unknown command {command!r}"
+
+
+class PuzzleServer:
+    """
+    The asyncio server and its counters.
+
+    Attributes:
+        sessions: sessions connected now
+        peak_sessions: most sessions connected at once
+        total_sessions: sessions accepted since start
+        refused: connections refused because the server was full
+        timeouts: sessions closed for being idle
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, idle_timeout=IDLE_TIMEOUT,
+                 max_sessions=MAX_SESSIONS):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = self.peak_sessions = self.total_sessions = 0
+        self.refused = self.timeouts = 0
+        self._server = None
+        self._sweeper = None
+        self._open = {}  # writer -> Session, for the idle sweep
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port,
+                                                  limit=MAX_LINE, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.ensure_future(self._sweep())
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        self._sweeper.cancel()
+        self._server.close()
+
+    async def _sweep(self):
+        """
+        Close the sessions idle for longer than the idle timeout.
+
+        One task checks every session a few times per timeout, which is much
+        cheaper than a timer around every read.
+        """
+        while True:
+            await asyncio.sleep(self.idle_timeout / 4)
+            limit = time.monotonic() - self.idle_timeout
+            for writer, session in list(self._open.items()):
+                if session.last_active < limit:
+                    self.timeouts += 1
+                    writer.write(b"ERR idle timeout\n")
+                    writer.close()
+
+    async def _serve(self, reader, writer):
+        if self.sessions >= self.max_sessions:
+            self.refused += 1
+            writer.write(b"ERR server full\n")
+            await self._close(writer)
+            return
+        self.sessions += 1
+        self.total_sessions += 1
+        self.peak_sessions = max(self.peak_sessions, self.sessions)
+        session = Session()
+        self._open[writer] = session
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_LINE
+                    writer.write(b"ERR line too long\n")
+                    break
+                if not line or writer.is_closing():
+                    break
+                session.last_active = time.monotonic()
+                reply = session.handle(line.decode('ascii', 'replace'))
+                if reply is None:
+                    writer.write(b"BYE\n")
+                    break
+                # Replies may echo undecodable input back as U+FFFD.
+                writer.write(reply.encode('ascii', 'backslashreplace') + b'\n')
+                await writer.drain()  # waits only when the client is not reading
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            del self._open[writer]
+            await self._close(writer)
+
+    async def _close(self, writer):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def stats(self):
+        return (f"{self.sessions} sessions ({self.peak_sessions} peak, {self.total_sessions} total), "
+                f"{self.timeouts} timed out, {self.refused} refused")
+
+
+def raise_file_limit():
+    """Raise the soft limit of open files to the hard limit, for many sockets."""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def _main(args):
+    server = await PuzzleServer(args.host, args.port, args.idle_timeout, args.max_sessions).start()
+    print(f"Serving sliding puzzles on {args.host}:{server.port}", flush=True)
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(server.stats(), flush=True)
+
+    if args.report_interval:
+        asyncio.ensure_future(report())
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host sliding-puzzle sessions over TCP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT, help="seconds")
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS)
+    parser.add_argument('--report-interval', type=float, default=0,
+                        help="print the counters every this many seconds")
+    args = parser.parse_args()
+    raise_file_limit()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Optimal solver for the sliding puzzle.
+
+Boards are given in the list-of-lists format used by CLI_sliding_puzzle.py,
+with 0 marking the empty space, and are solved with IDA* guided by the
+Manhattan distance plus linear conflicts.
+
+Moves are reported with the direction names the CLI uses: the direction in
+which a tile slides into the empty space ('left', 'right', 'up', 'down').
+"""
+
+import time
+from bisect import bisect_left
+
+EMPTY_SPACE = 0
+
+# Movement of the empty space for each move, as (row, col) deltas.
+# Sliding a tile to the left moves the empty space one column to the right.
+BLANK_OFFSETS = {'left': (0, 1), 'right': (0, -1), 'up': (1, 0), 'down': (-1, 0)}
+OPPOSITE_MOVE = {'left': 'right', 'right': 'left', 'up': 'down', 'down': 'up'}
+
+# How many expansions pass between two checks of the search deadline.
+DEADLINE_CHECK_INTERVAL = 4096
+
+_tables_cache = {}
+
+
+class SearchTimeout(Exception):
+    """Raised when a search runs past its deadline."""
+
+    def __init__(self, nodes):
+        super().__init__(f"Search stopped after {nodes} expanded nodes.")
+        self.nodes = nodes
+
+
+def flatten(puzzle):
+    """Return the tiles of a list-of-lists puzzle as a flat list, row by row."""
+    return [tile for row in puzzle for tile in row]
+
+
+def goal_state(size):
+    """Return the solved board of the given size as a flat tuple."""
+    return tuple(range(1, size * size)) + (EMPTY_SPACE,)
+
+
+def get_tables(size):
+    """
+    Return the precomputed lookup tables for a board of the given size.
+
+    The tables are built once per size and shared by every search:
+    neighbors[cell] lists (target_cell, direction) for each move that is
+    possible while the empty space sits on `cell`, and distance[tile][cell]
+    is the Manhattan distance of `tile` from its goal when placed on `cell`.
+
+    Returns:
+        tuple: (neighbors, distance, goal_row, goal_col)
+    """
+    if size in _tables_cache:
+        return _tables_cache[size]
+    n = size * size
+    goal_row = [0] * n
+    goal_col = [0] * n
+    for tile in range(1, n):
+        goal_row[tile], goal_col[tile] = divmod(tile - 1, size)
+    goal_row[EMPTY_SPACE], goal_col[EMPTY_SPACE] = size - 1, size - 1
+
+    neighbors = []
+    for cell in range(n):
+        row, col = divmod(cell, size)
+        moves = []
+        for direction, (d_row, d_col) in BLANK_OFFSETS.items():
+            r, c = row + d_row, col + d_col
+            if 0 <= r < size and 0 <= c < size:
+                moves.append((r * size + c, direction))
+        neighbors.append(tuple(moves))
+
+    distance = [[0] * n for _ in range(n)]
+    for tile in range(1, n):
+        for cell in range(n):
+            row, col = divmod(cell, size)
+            distance[tile][cell] = abs(row - goal_row[tile]) + abs(col - goal_col[tile])
+
+    tables = (tuple(neighbors), distance, goal_row, goal_col)
+    _tables_cache[size] = tables
+    return tables
+
+
+def manhattan_distance(tiles, size):
+    """Sum of the Manhattan distances of every tile from its goal cell."""
+    distance = get_tables(size)[1]
+    return sum(distance[tile][cell] for cell, tile in enumerate(tiles) if tile != EMPTY_SPACE)
+
+
+def _removals(values):
+    """
+    Number of tiles that must leave a line to resolve its linear conflicts.
+
+    `values` are the goal offsets of the tiles that belong to the line, in
+    their current order; the tiles that can stay form the longest increasing
+    subsequence, every other tile has to step out of the line and back.
+    """
+    tails = []
+    for value in values:
+        i = bisect_left(tails, value)
+        if i == len(tails):
+            tails.append(value)
+        else:
+            tails[i] = value
+    return len(values) - len(tails)
+
+
+def _row_removals(tiles, size, row, goal_row, goal_col):
+    """Linear-conflict removals needed in one row."""
+    start = row * size
+    return _removals([goal_col[tile] for tile in tiles[start:start + size]
+                      if tile != EMPTY_SPACE and goal_row[tile] == row])
+
+
+def _col_removals(tiles, size, col, goal_row, goal_col):
+    """Linear-conflict removals needed in one column."""
+    return _removals([goal_row[tile] for tile in tiles[col::size]
+                      if tile != EMPTY_SPACE and goal_col[tile] == col])
+
+
+def linear_conflicts(tiles, size):
+    """
+    Extra moves implied by linear conflicts on the board.
+
+    Two tiles are in linear conflict when they are both in their goal row
+    (or column) but in reversed order; resolving it costs at least two moves
+    on top of the Manhattan distance.
+    """
+    _, _, goal_row, goal_col = get_tables(size)
+    removals = sum(_row_removals(tiles, size, i, goal_row, goal_col) for i in range(size))
+    removals += sum(_col_removals(tiles, size, i, goal_row, goal_col) for i in range(size))
+    return 2 * removals
+
+
+def count_inversions(tiles):
+    """
+    Count the pairs of numbered tiles that are out of order.
+
+    Scans the board from the end with a Fenwick tree over the tile numbers,
+    so each tile costs O(log n) instead of a pass over every later tile.
+    """
+    n = len(tiles)
+    tree = [0] * (n + 1)
+    inversions = 0
+    for i in range(n - 1, -1, -1):
+        tile = tiles[i]
+        if tile == EMPTY_SPACE:
+            continue
+        # Tiles smaller than this one that were already seen to its right.
+        j = tile - 1
+        while j > 0:
+            inversions += tree[j]
+            j -= j & -j
+        j = tile
+        while j <= n:
+            tree[j] += 1
+            j += j & -j
+    return inversions
+
+
+def is_solvable(tiles, size):
+    """
+    Check whether a flat board can reach the goal state.
+
+    For odd widths the inversion count must be even. For even widths every
+    vertical move changes both the inversion parity and the row of the empty
+    space, so the inversion count plus the row of the empty space (counted
+    from the bottom, as in GUI_sliding_puzzle.py) must keep the parity it
+    has on the solved board, which is odd.
+    """
+    inversions = count_inversions(tiles)
+    if size % 2 != 0:
+        return inversions % 2 == 0
+    blank_row = size - list(tiles).index(EMPTY_SPACE) // size
+    return (inversions + blank_row) % 2 == 1
+
+
+class ManhattanHeuristic:
+    """
+    Manhattan distance plus linear conflicts, maintained incrementally.
+
+    Heuristics used by ida_star() share one small interface: reset(tiles)
+    starts tracking a board and returns its estimate, move(tile, source,
+    target) records a tile slide and returns the change in the estimate.
+    Undoing a slide is simply the reverse move.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.neighbors, self.distance, self.goal_row, self.goal_col = get_tables(size)
+        self.tiles = []
+        self.row_lc = []
+        self.col_lc = []
+
+    def reset(self, tiles):
+        """Start tracking `tiles` and return its estimate."""
+        size, goal_row, goal_col = self.size, self.goal_row, self.goal_col
+        self.tiles = list(tiles)
+        self.row_lc = [_row_removals(self.tiles, size, i, goal_row, goal_col) for i in range(size)]
+        self.col_lc = [_col_removals(self.tiles, size, i, goal_row, goal_col) for i in range(size)]
+        return manhattan_distance(self.tiles, size) + 2 * (sum(self.row_lc) + sum(self.col_lc))
+
+    def move(self, tile, source, target):
+        """Slide `tile` from cell `source` to the empty cell `target`."""
+        tiles, size = self.tiles, self.size
+        tiles[target], tiles[source] = tile, EMPTY_SPACE
+        delta = self.distance[tile][target] - self.distance[tile][source]
+
+        # Only the lines crossed by the moving tile can change, and only
+        # if the tile belongs to one of them.
+        if source - target in (1, -1):
+            line, lines, count = self.goal_col[tile], self.col_lc, _col_removals
+            if line != source % size and line != target % size:
+                return delta
+        else:
+            line, lines, count = self.goal_row[tile], self.row_lc, _row_removals
+            if line != source // size and line != target // size:
+                return delta
+        old = lines[line]
+        lines[line] = count(tiles, size, line, self.goal_row, self.goal_col)
+        return delta + 2 * (lines[line] - old)
+
+
+def ida_star(tiles, size, heuristic=None, deadline=None):
+    """
+    Find a shortest move sequence for a flat board using IDA*.
+
+    Args:
+        tiles: flat sequence of the board, row by row, 0 for the empty space
+        size: width of the board
+        heuristic: admissible estimate with the ManhattanHeuristic interface,
+            defaults to Manhattan distance plus linear conflicts
+        deadline: optional time.perf_counter() value after which to give up
+
+    Returns:
+        tuple: (moves, nodes) where moves is the list of directions and
+        nodes the number of expanded states.
+
+    Raises:
+        SearchTimeout: if the deadline passes before a solution is found.
+    """
+    tiles = list(tiles)
+    goal = list(goal_state(size))
+    neighbors = get_tables(size)[0]
+    if heuristic is None:
+        heuristic = ManhattanHeuristic(size)
+    move = heuristic.move
+    path = []
+    nodes = 0
+    next_bound = 0
+
+    def search(blank, g, bound, h, prev):
+        nonlocal nodes, next_bound
+        f = g + h
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            return False
+        if h == 0 and tiles == goal:
+            return True
+        nodes += 1
+        if deadline is not None and nodes % DEADLINE_CHECK_INTERVAL == 0 \
+                and time.perf_counter() > deadline:
+            raise SearchTimeout(nodes)
+        for target, direction in neighbors[blank]:
+            if target == prev:
+                continue
+            tile = tiles[target]
+            tiles[blank], tiles[target] = tile, EMPTY_SPACE
+            path.append(direction)
+            if search(target, g + 1, bound, h + move(tile, target, blank), blank):
+                return True
+            path.pop()
+            move(tile, blank, target)
+            tiles[blank], tiles[target] = EMPTY_SPACE, tile
+        return False
+
+    bound = h = heuristic.reset(tiles)
+    blank = tiles.index(EMPTY_SPACE)
+    while True:
+        next_bound = float('inf')
+        if search(blank, 0, bound, h, None):
+            return path, nodes
+        bound = next_bound
+
+
+def solve_puzzle(puzzle, heuristic=None):
+    """
+    Return a shortest list of moves that solves a list-of-lists puzzle.
+
+    Args:
+        puzzle: the board, e.g. as produced by generate_solvable_puzzle()
+        heuristic: optional heuristic object, see ida_star()
+
+    Returns:
+        list: directions ('left', 'right', 'up', 'down') of the tile slides.
+
+    Raises:
+        ValueError: if the puzzle cannot be solved.
+    """
+    size = len(puzzle)
+    tiles = flatten(puzzle)
+    if not is_solvable(tiles, size):
+        raise ValueError("The puzzle is not solvable.")
+    moves, _ = ida_star(tiles, size, heuristic)
+    return moves
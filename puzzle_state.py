@@ -0,0 +1,172 @@
+"""
+Bit-packed board state for the sliding puzzle.
+
+A PackedState stores the whole board in a single int: 4 bits per cell for
+boards up to 4x4, 8 bits per cell for larger boards (16 bits above 15x15).
+The empty space is tracked explicitly and its legal moves come from
+neighbor tables precomputed once per size, so a move is a table lookup and
+two bit operations, and checking for the solved board is one comparison.
+
+It converts to and from the list-of-lists format used by
+CLI_sliding_puzzle.py and GUI_sliding_puzzle.py, and iterates like that
+format (rows of tiles), so printing and the solvers accept it directly.
+"""
+
+from puzzle_solver import BLANK_OFFSETS, EMPTY_SPACE, goal_state
+
+_layouts = {}
+
+
+class _Layout:
+    """Per-size tables shared by all states of that size."""
+
+    def __init__(self, size):
+        n = size * size
+        if n <= 16:
+            self.width = 4
+        elif n <= 256:
+            self.width = 8
+        else:
+            self.width = 16
+        self.mask = (1 << self.width) - 1
+        self.shift = tuple(cell * self.width for cell in range(n))
+        # targets[cell][direction] is the cell holding the tile that slides
+        # in that direction when the empty space is on `cell`, or -1.
+        targets = []
+        for cell in range(n):
+            row, col = divmod(cell, size)
+            moves = {}
+            for direction, (d_row, d_col) in BLANK_OFFSETS.items():
+                r, c = row + d_row, col + d_col
+                moves[direction] = r * size + c if 0 <= r < size and 0 <= c < size else -1
+            targets.append(moves)
+        self.targets = tuple(targets)
+        self.valid = tuple(tuple(d for d, t in moves.items() if t >= 0) for moves in targets)
+        self.goal = pack(goal_state(size), self.width)
+
+
+def get_layout(size):
+    """Return the cached tables for boards of the given size."""
+    layout = _layouts.get(size)
+    if layout is None:
+        layout = _layouts[size] = _Layout(size)
+    return layout
+
+
+def pack(tiles, width):
+    """Pack a flat sequence of tiles into an int, first cell in the low bits."""
+    bits = 0
+    for cell in range(len(tiles) - 1, -1, -1):
+        bits = (bits << width) | tiles[cell]
+    return bits
+
+
+class PackedState:
+    """
+    A sliding-puzzle board packed into one int.
+
+    Attributes:
+        size: width of the board
+        bits: the packed tiles
+        blank: index of the empty cell, row * size + col
+    """
+
+    __slots__ = ('size', 'bits', 'blank', '_layout')
+
+    def __init__(self, size, bits, blank):
+        self.size = size
+        self.bits = bits
+        self.blank = blank
+        self._layout = get_layout(size)
+
+    @classmethod
+    def from_tiles(cls, tiles, size):
+        """Create a state from a flat sequence of tiles."""
+        return cls(size, pack(tiles, get_layout(size).width), list(tiles).index(EMPTY_SPACE))
+
+    @classmethod
+    def from_puzzle(cls, puzzle):
+        """Create a state from a list-of-lists puzzle."""
+        return cls.from_tiles([tile for row in puzzle for tile in row], len(puzzle))
+
+    @classmethod
+    def solved(cls, size):
+        """Create the solved board of the given size."""
+        layout = get_layout(size)
+        return cls(size, layout.goal, size * size - 1)
+
+    def to_tiles(self):
+        """Return the board as a flat list of tiles."""
+        layout = self._layout
+        bits, width, mask = self.bits, layout.width, layout.mask
+        tiles = []
+        for _ in range(self.size * self.size):
+            tiles.append(bits & mask)
+            bits >>= width
+        return tiles
+
+    def to_puzzle(self):
+        """Return the board in the list-of-lists format."""
+        tiles, size = self.to_tiles(), self.size
+        return [tiles[i * size:(i + 1) * size] for i in range(size)]
+
+    def copy(self):
+        return PackedState(self.size, self.bits, self.blank)
+
+    def tile_at(self, row, col):
+        """Return the tile on a cell."""
+        layout = self._layout
+        return (self.bits >> layout.shift[row * self.size + col]) & layout.mask
+
+    @property
+    def empty_position(self):
+        """Row and column of the empty space."""
+        return divmod(self.blank, self.size)
+
+    def move(self, direction):
+        """
+        Slide the tile next to the empty space in `direction`.
+
+        Args:
+            direction: 'left', 'right', 'up' or 'down', as in puzzle_solver
+
+        Returns:
+            bool: True if the move was made, False if it is not possible.
+        """
+        layout = self._layout
+        target = layout.targets[self.blank][direction]
+        if target < 0:
+            return False
+        shift = layout.shift
+        tile = (self.bits >> shift[target]) & layout.mask
+        self.bits ^= (tile << shift[target]) | (tile << shift[self.blank])
+        self.blank = target
+        return True
+
+    def valid_moves(self):
+        """Directions that are possible from the current state."""
+        return self._layout.valid[self.blank]
+
+    def is_solved(self):
+        """Check if the puzzle is solved."""
+        return self.bits == self._layout.goal
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.to_puzzle())
+
+    def __getitem__(self, row):
+        return self.to_puzzle()[row]
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedState):
+            return NotImplemented
+        return self.size == other.size and self.bits == other.bits
+
+    def __hash__(self):
+        return hash((self.size, self.bits))
+
+    def __repr__(self):
+        return f"PackedState.from_puzzle({self.to_puzzle()!r})"
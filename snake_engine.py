@@ -0,0 +1,712 @@
+"""
+Headless Snake engine.
+
+The rules of GUI_Snake.py on an integer grid, without turtle: the play
+area is cols x rows cells (COLS x ROWS by default, up to MAX_SIDE on a
+side, as set by a BoardConfig), column 0 on the left and row 0 at the
+bottom. The snake, every monster and the food move on their own timers,
+as events of one event_scheduler.Scheduler on a virtual clock counted in
+milliseconds, so a game plays the same for the same seed:
+- step(action) plays one snake tick, for agents and batch runs;
+- advance(until) plays up to a time, for a GUI following the wall clock;
+- fast_forward() plays on without input as fast as the CPU allows.
+The first win or loss stops the scheduler, which cancels every pending
+event.
+
+The pixel rules become cell rules:
+- the snake starts on the start cell with size START_SIZE and no body;
+  each move leaves a body segment behind the head and drops the oldest one
+  beyond `size` segments. A move that would leave the play area is blocked.
+- food items 1 to FOOD_COUNT sit on distinct cells; eating one adds its
+  value to `size`. Every 5 to 8 seconds some of them jump FOOD_STEP cells,
+  staying off the border cells.
+- monsters step one cell towards the head, along the axis of the angle to
+  the head rounded to a multiple of 90 degrees, every snake interval plus
+  -50 to 1200 ms. A monster on or next to the snake counts a contact.
+  With pursuit='flow' they follow a shared FlowField instead, around the
+  body and without stacking, for swarms of hundreds of monsters.
+- the game is won when the body reaches WIN_LENGTH segments and lost when
+  a monster reaches the head.
+
+An OccupancyGrid, kept up to date as things move, tells what is in a cell
+in O(1), so no rule scans the body, the food or the monsters. It also keeps
+the empty cells in FreeCells sets, from which food and monsters spawn on a
+uniformly drawn empty cell in O(1), however full the board: one set for
+the whole board and one for the cells where monsters may start. Once the
+snake has its full length, a tick keeps no new objects: the body is a
+ring buffer of cell indices, moves add offsets from a table, and food and
+monsters are updated in place.
+"""
+
+import itertools
+import math
+import random
+from array import array
+
+from event_scheduler import Scheduler
+
+COLS = ROWS = 25
+MAX_SIDE = 1000  # most cells on a side of the board
+START_SIZE = 5
+WIN_LENGTH = 20
+FOOD_COUNT = 5
+FOOD_STEP = 2  # cells a food item jumps
+MONSTER_COUNT = 4
+MONSTER_MIN_DISTANCE = 7.5  # cells from the start cell
+INTRO_HALF_WIDTH = 6  # monsters never start within this many columns of the start cell
+
+SNAKE_INTERVAL = 250  # ms between two snake moves
+GROWING_INTERVAL = 450  # ms between two snake moves while the snake grows
+MONSTER_DELAY = (-50, 1200)  # added to the snake interval between monster moves
+FOOD_FIRST_MOVE = 5000
+FOOD_DELAY = (5000, 8000)
+# Events at the same time run monsters and food first, then the snake
+SNAKE_PRIORITY = 1
+PURSUITS = ('angle', 'flow')  # how monsters chase the head
+
+# Column and row change of a snake move, by arrow key
+DIRECTIONS = {'Up': (0, 1), 'Down': (0, -1), 'Left': (-1, 0), 'Right': (1, 0)}
+FOOD_JUMPS = ((FOOD_STEP, 0), (-FOOD_STEP, 0), (0, FOOD_STEP), (0, -FOOD_STEP))
+
+
+# What a cell holds, as bits of OccupancyGrid.flags
+HEAD = 1
+BODY = 2
+FOOD = 4
+MONSTER = 8
+WALL = 16  # the border around the play area
+SNAKE = HEAD | BODY
+
+# What FlowField.seen holds for a cell: not reached yet, a wall or the body, reached
+UNSEEN, BLOCKED, REACHED = 0, 1, 2
+SEEN_BY_FLAGS = bytes(BLOCKED if flags & (WALL | BODY) else UNSEEN for flags in range(256))
+
+
+class BoardConfig:
+    """
+    Size of the board and the counts and distances that depend on it.
+
+    Every bound the engine checks comes from here. The start cell defaults
+    to the middle column and the row above the middle one, (12, 13) on the
+    25 x 25 board of GUI_Snake.py.
+    """
+
+    __slots__ = ('cols', 'rows', 'start', 'win_length', 'food_count', 'monster_count',
+                 'monster_min_distance', 'intro_half_width', 'pursuit')
+
+    def __init__(self, cols=COLS, rows=ROWS, start=None, win_length=WIN_LENGTH,
+                 food_count=FOOD_COUNT, monster_count=MONSTER_COUNT,
+                 monster_min_distance=MONSTER_MIN_DISTANCE, intro_half_width=INTRO_HALF_WIDTH,
+                 pursuit='angle'):
+        if not (FOOD_STEP + 1 <= cols <= MAX_SIDE and FOOD_STEP + 1 <= rows <= MAX_SIDE):
+            raise ValueError(f"the board must have {FOOD_STEP + 1} to {MAX_SIDE} cells on a side")
+        self.cols = cols
+        self.rows = rows
+        self.start = start if start is not None else (cols // 2, min(rows // 2 + 1, rows - 1))
+        if not self.inside(*self.start):
+            raise ValueError(f"start cell {self.start} is off the board")
+        self.win_length = win_length
+        self.food_count = food_count
+        self.monster_count = monster_count
+        self.monster_min_distance = monster_min_distance
+        self.intro_half_width = intro_half_width
+        if pursuit not in PURSUITS:
+            raise ValueError(f"pursuit must be one of {', '.join(PURSUITS)}")
+        self.pursuit = pursuit
+
+    @property
+    def cells(self):
+        return self.cols * self.rows
+
+    def inside(self, col, row):
+        """Check if a cell is on the play area."""
+        return 0 <= col < self.cols and 0 <= row < self.rows
+
+    def interior(self, col, row):
+        """Check if a cell is on the play area and off its border, where food may jump to."""
+        return 0 < col < self.cols - 1 and 0 < row < self.rows - 1
+
+    def monster_may_start(self, col, row):
+        """Check if a cell is far enough from the start and outside the intro band."""
+        start_col, start_row = self.start
+        return math.hypot(col - start_col, row - start_row) >= self.monster_min_distance \
+            and abs(col - start_col) > self.intro_half_width
+
+    def monster_start_columns(self, row):
+        """
+        The columns of a row where monster_may_start() holds, as a list of
+        (first, stop) ranges: both rules only ask for a large enough column
+        distance to the start.
+        """
+        start_col, start_row = self.start
+        gap = max(0, self.intro_half_width + 1)
+        while math.hypot(gap, row - start_row) < self.monster_min_distance:
+            gap += 1
+        if gap == 0:
+            return [(0, self.cols)]
+        return [(first, stop) for first, stop in ((0, start_col - gap + 1), (start_col + gap, self.cols))
+                if first < stop]
+
+
+class FreeCells:
+    """
+    A set of grid indices with O(1) add, remove and uniform choice.
+
+    `cells[:count]` holds the members in no particular order and `slot[k]`
+    is the position of k in it, or ABSENT; removing a member moves the last
+    one into its slot. Only the `candidates` given at creation may be added.
+    """
+
+    __slots__ = ('cells', 'slot', 'count')
+    ABSENT = 0xFFFFFFFF
+
+    def __init__(self, size, ranges):
+        """Make the set of the indices in `ranges`, (first, stop) pairs below `size`."""
+        self.cells = array('I', itertools.chain.from_iterable(itertools.starmap(range, ranges)))
+        self.count = len(self.cells)
+        self.slot = array('I', [self.ABSENT]) * size
+        positions = array('I', range(self.count))
+        position = 0
+        for first, stop in ranges:
+            self.slot[first:stop] = positions[position:position + stop - first]
+            position += stop - first
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, k):
+        return self.slot[k] != self.ABSENT
+
+    def add(self, k):
+        if self.slot[k] == self.ABSENT:
+            self.cells[self.count] = k
+            self.slot[k] = self.count
+            self.count += 1
+
+    def remove(self, k):
+        position = self.slot[k]
+        if position != self.ABSENT:
+            self.count -= 1
+            last = self.cells[self.count]
+            self.cells[position] = last
+            self.slot[last] = position
+            self.slot[k] = self.ABSENT
+
+    def choice(self, rng):
+        """A member drawn uniformly with `rng`, or None if the set is empty."""
+        if not self.count:
+            return None
+        return self.cells[rng.randrange(self.count)]
+
+
+class OccupancyGrid:
+    """
+    What is in every cell, updated as the snake, food and monsters move.
+
+    The play area is surrounded by a border of WALL cells, so cell
+    (col, row) has index (row + 1) * stride + col + 1 with stride = cols + 2,
+    and a neighbour is always the index plus one of `offsets`, without
+    bounds checks. `flags` holds the HEAD, BODY, FOOD, MONSTER and WALL bits
+    of each cell; body segments and monsters may share a cell, so they are
+    also counted per cell, and `food` gives the index in SnakeGame.food of
+    the food item on a cell.
+
+    `free` is the FreeCells set of the empty cells and `monster_free` that
+    of the empty cells in the columns `monster_columns(row)` gives for each
+    row, the whole board by default; every change of `flags` goes through
+    _set() and _clear(), which keep them.
+    """
+
+    def __init__(self, cols, rows, monster_columns=None):
+        self.cols = cols
+        self.rows = rows
+        self.stride = stride = cols + 2
+        size = stride * (rows + 2)
+        self.flags = bytearray([WALL]) * size
+        for row in range(rows):
+            k = self.index(0, row)
+            self.flags[k:k + cols] = bytes(cols)
+        self.body = array('I', bytes(4 * size))
+        self.monsters = array('I', bytes(4 * size))
+        self.food = array('I', bytes(4 * size))
+        # Index change of a move, by arrow key
+        self.offsets = {key: d_row * stride + d_col for key, (d_col, d_row) in DIRECTIONS.items()}
+        self.free = FreeCells(size, [(self.index(0, row), self.index(cols, row)) for row in range(rows)])
+        monster_ranges = []
+        for row in range(rows):
+            k = self.index(0, row)
+            for first, stop in monster_columns(row) if monster_columns else [(0, cols)]:
+                monster_ranges.append((k + first, k + stop))
+        self.monster_region = bytearray(size)
+        for first, stop in monster_ranges:
+            self.monster_region[first:stop] = b'\x01' * (stop - first)
+        self.monster_free = FreeCells(size, monster_ranges)
+
+    def index(self, col, row):
+        return (row + 1) * self.stride + col + 1
+
+    def cell(self, k):
+        """The (col, row) of index k."""
+        row, col = divmod(k, self.stride)
+        return col - 1, row - 1
+
+    def at(self, col, row):
+        """The HEAD, BODY, FOOD and MONSTER bits of a cell, 0 if it is empty."""
+        return self.flags[(row + 1) * self.stride + col + 1]
+
+    def _set(self, k, bit):
+        flags = self.flags[k]
+        if not flags:
+            self.free.remove(k)
+            if self.monster_region[k]:
+                self.monster_free.remove(k)
+        self.flags[k] = flags | bit
+
+    def _clear(self, k, bit):
+        flags = self.flags[k] & ~bit
+        self.flags[k] = flags
+        if not flags:
+            self.free.add(k)
+            if self.monster_region[k]:
+                self.monster_free.add(k)
+
+    def move_head(self, k, previous=None):
+        if previous is not None:
+            self._clear(previous, HEAD)
+        self._set(k, HEAD)
+
+    def add_body(self, k):
+        self.body[k] += 1
+        self._set(k, BODY)
+
+    def remove_body(self, k):
+        self.body[k] -= 1
+        if not self.body[k]:
+            self._clear(k, BODY)
+
+    def add_monster(self, k):
+        self.monsters[k] += 1
+        self._set(k, MONSTER)
+
+    def remove_monster(self, k):
+        self.monsters[k] -= 1
+        if not self.monsters[k]:
+            self._clear(k, MONSTER)
+
+    def add_food(self, k, position):
+        self.food[k] = position
+        self._set(k, FOOD)
+
+    def remove_food(self, k):
+        self._clear(k, FOOD)
+
+    def near_snake(self, k):
+        """Check if the snake is on cell k or on one of its 4 neighbours."""
+        flags, stride = self.flags, self.stride
+        return bool((flags[k] | flags[k - 1] | flags[k + 1] | flags[k - stride] | flags[k + stride])
+                    & SNAKE)
+
+
+class FlowField:
+    """
+    Distance to the head, and the next cell towards it, for the cells
+    monsters may cross: everything but the walls and the body.
+
+    The field belongs to one head position and is searched lazily:
+    reset() only records a new head, and the breadth-first search from it
+    runs when a monster asks for a cell it has not reached yet, and only
+    until it does. All the monsters share the search, which therefore
+    costs at most one pass over the board per snake move, however many
+    monsters there are, and a lookup per monster step.
+    """
+
+    def __init__(self, grid):
+        size = len(grid.flags)
+        self.grid = grid
+        self.head = None
+        self.seen = None  # built from the grid when the search of a head starts
+        self.distance = array('I', bytes(4 * size))
+        self.toward = array('I', bytes(4 * size))  # next cell on a shortest path to the head
+        self.queue = array('I', bytes(4 * size))
+        self.first = self.last = 0  # cells of the queue still to expand
+
+    def reset(self, head):
+        """Make the field that of a new head."""
+        self.head = head
+        self.seen = None
+
+    def next_cell(self, k):
+        """The cell after k on a shortest path to the head, or k if the head cannot be reached."""
+        if self.seen is None:
+            self._start()
+        if self.seen[k] != REACHED:
+            self._search(k)
+            if self.seen[k] != REACHED:
+                return k
+        return self.toward[k]
+
+    def _start(self):
+        head = self.head
+        self.seen = self.grid.flags.translate(SEEN_BY_FLAGS)
+        self.seen[head] = REACHED
+        self.distance[head] = 0
+        self.toward[head] = head
+        self.queue[0] = head
+        self.first, self.last = 0, 1
+
+    def _search(self, target):
+        """Go on with the breadth-first search until it reaches `target` or the board is done."""
+        seen, distance, toward, queue = self.seen, self.distance, self.toward, self.queue
+        first, last, stride = self.first, self.last, self.grid.stride
+        reached = REACHED
+        while first < last and seen[target] != reached:
+            k = queue[first]
+            first += 1
+            d = distance[k] + 1
+            # The four neighbours, unrolled: this loop is the whole cost of the field.
+            n = k + 1
+            if not seen[n]:
+                seen[n], distance[n], toward[n], queue[last] = reached, d, k, n
+                last += 1
+            n = k - 1
+            if not seen[n]:
+                seen[n], distance[n], toward[n], queue[last] = reached, d, k, n
+                last += 1
+            n = k + stride
+            if not seen[n]:
+                seen[n], distance[n], toward[n], queue[last] = reached, d, k, n
+                last += 1
+            n = k - stride
+            if not seen[n]:
+                seen[n], distance[n], toward[n], queue[last] = reached, d, k, n
+                last += 1
+        self.first, self.last = first, last
+
+
+class SnakeBody:
+    """
+    Grid indices of the body segments, oldest first, in a ring buffer.
+
+    The buffer is allocated once for `capacity` segments, so pushing a new
+    segment and dropping the oldest one neither allocate nor move anything.
+    """
+
+    __slots__ = ('cells', 'capacity', 'first', 'length')
+
+    def __init__(self, capacity):
+        self.cells = array('I', bytes(4 * capacity))
+        self.capacity = capacity
+        self.first = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for n in range(self.length):
+            yield self.cells[(self.first + n) % self.capacity]
+
+    def __getitem__(self, n):
+        """The n-th segment, oldest first; negative n counts from the newest."""
+        if not -self.length <= n < self.length:
+            raise IndexError("snake body index out of range")
+        return self.cells[(self.first + n % self.length) % self.capacity]
+
+    def push(self, k):
+        if self.length == self.capacity:
+            raise OverflowError("the snake body is full")
+        self.cells[(self.first + self.length) % self.capacity] = k
+        self.length += 1
+
+    def pop_oldest(self):
+        k = self.cells[self.first]
+        self.first = (self.first + 1) % self.capacity
+        self.length -= 1
+        return k
+
+
+class SnakeGame:
+    """
+    One game of Snake.
+
+    Attributes:
+        config: the BoardConfig of the game
+        head: (col, row) of the head
+        body: SnakeBody of the grid indices of the body segments, oldest
+            first, without the head; segments() gives their cells
+        size: number of body segments the snake grows to
+        moves: number of snake moves made, blocked ones aside
+        food: list of [col, row, value] of the food items left
+        monsters: list of [col, row] of the monsters
+        contacts: number of monster moves that touched the snake
+        direction: arrow key the snake follows, None before the first one
+        paused: whether the snake stands still; monsters keep moving
+        blocked: whether the last snake move was blocked by a wall
+        time: virtual clock in milliseconds
+        result: None while playing, then 'win' or 'lose'
+        grid: OccupancyGrid of the snake, food and monsters
+        field: FlowField the monsters follow with pursuit='flow', else None
+        scheduler: the Scheduler of the snake, monster and food events
+    """
+
+    def __init__(self, seed=None, config=None):
+        self.rng = random.Random(seed)
+        self.config = config if config is not None else BoardConfig()
+        self.grid = OccupancyGrid(self.config.cols, self.config.rows, self.config.monster_start_columns)
+        self.scheduler = Scheduler()
+        self._head = self.grid.index(*self.config.start)
+        self.grid.move_head(self._head)
+        self.field = None
+        if self.config.pursuit == 'flow':
+            self.field = FlowField(self.grid)
+            self.field.reset(self._head)
+        # The game is won as the body reaches win_length segments.
+        self.body = SnakeBody(self.config.win_length)
+        self.size = START_SIZE
+        self.moves = 0
+        self.food = []
+        self.monsters = []
+        self.contacts = 0
+        self.direction = None
+        self.paused = False
+        self.blocked = False
+        self.result = None
+        self._place_monsters(self.config.monster_count)
+        self._place_food(self.config.food_count)
+        # One event per mover, rescheduled after each move.
+        self._snake_event = self.scheduler.schedule(0, self._on_snake, priority=SNAKE_PRIORITY)
+        self._monster_events = []
+        for k, monster in enumerate(self.monsters):
+            # The monsters take a first step as the game starts.
+            self._step_monster(monster)
+            self._monster_events.append(
+                self.scheduler.schedule(self._monster_delay(), self._on_monster, k))
+        if self.food:
+            self._food_event = self.scheduler.schedule(FOOD_FIRST_MOVE, self._on_food)
+
+    @property
+    def head(self):
+        return self.grid.cell(self._head)
+
+    @property
+    def time(self):
+        return self.scheduler.time
+
+    @property
+    def over(self):
+        return self.result is not None
+
+    @property
+    def seconds(self):
+        """Whole seconds of play."""
+        return self.time // 1000
+
+    @property
+    def interval(self):
+        """Milliseconds until the next snake move."""
+        return GROWING_INTERVAL if len(self.body) < self.size else SNAKE_INTERVAL
+
+    def next_event_time(self):
+        """Virtual time of the next event, None once the game is over."""
+        return self.scheduler.next_time()
+
+    def segments(self):
+        """The (col, row) of the body segments, oldest first."""
+        return [self.grid.cell(k) for k in self.body]
+
+    def _monster_delay(self):
+        return self.time + self.interval + self.rng.randint(*MONSTER_DELAY)
+
+    def _place_monsters(self, count):
+        """Put up to `count` monsters on empty cells where monsters may start, while there are some."""
+        for _ in range(count):
+            k = self.grid.monster_free.choice(self.rng)
+            if k is None:
+                break
+            self.monsters.append(list(self.grid.cell(k)))
+            self.grid.add_monster(k)
+
+    def _place_food(self, count):
+        """Put food items 1 to `count` on empty cells, while there are some."""
+        for value in range(1, count + 1):
+            k = self.grid.free.choice(self.rng)
+            if k is None:
+                break
+            self.grid.add_food(k, len(self.food))
+            self.food.append(list(self.grid.cell(k)) + [value])
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def turn(self, action):
+        """Follow the arrow key `action` from the next snake move on, and unpause."""
+        self.direction = action
+        self.paused = False
+
+    def step(self, action=None):
+        """
+        Play one snake tick: the next snake move, then the monster and food
+        events up to the snake move after it.
+
+        Args:
+            action: an arrow key ('Up', 'Down', 'Left' or 'Right') to turn
+                to and unpause, or None to keep going as before
+
+        Returns:
+            bool: True while the game goes on.
+        """
+        if self.result is not None:
+            return False
+        if action is not None:
+            self.turn(action)
+        self.scheduler.run_until(self._snake_event[0], SNAKE_PRIORITY)
+        self.scheduler.run_until(self._snake_event[0], SNAKE_PRIORITY - 1)
+        return self.result is None
+
+    def advance(self, until):
+        """
+        Play every event up to the virtual time `until`.
+
+        Returns:
+            bool: True while the game goes on.
+        """
+        return self.scheduler.run_until(until)
+
+    def fast_forward(self, limit=None):
+        """
+        Play on without input, as fast as possible, until the game is over
+        or the virtual time passes `limit`.
+
+        Returns:
+            bool: True while the game goes on.
+        """
+        return self.scheduler.run(limit)
+
+    def _on_snake(self, _):
+        if not self.paused and self.direction is not None:
+            self._move_snake()
+        self.scheduler.reschedule(self._snake_event, self.time + self.interval)
+
+    def _on_monster(self, k):
+        monster = self.monsters[k]
+        self._step_monster(monster)
+        self._touch(monster)
+        self._check_over()
+        self.scheduler.reschedule(self._monster_events[k], self._monster_delay())
+
+    def _on_food(self, _):
+        # Once every item is eaten, food stops moving.
+        if self.food:
+            self._move_food()
+            self.scheduler.reschedule(self._food_event, self.time + self.rng.randint(*FOOD_DELAY))
+
+    def _move_snake(self):
+        grid = self.grid
+        k = self._head + grid.offsets[self.direction]
+        self.blocked = bool(grid.flags[k] & WALL)
+        if self.blocked:
+            return
+        self.moves += 1
+        self.body.push(self._head)
+        grid.add_body(self._head)
+        grid.move_head(k, self._head)
+        self._head = k
+        if self.field is not None:
+            self.field.reset(k)
+        if len(self.body) > self.size:
+            grid.remove_body(self.body.pop_oldest())
+        if grid.flags[k] & FOOD:
+            self._eat(grid.food[k])
+        self._check_over()
+
+    def _eat(self, position):
+        """Grow by the value of a food item and remove it, moving the last item to its place."""
+        col, row, value = self.food[position]
+        self.size += value
+        self.grid.remove_food(self.grid.index(col, row))
+        last = self.food.pop()
+        if position < len(self.food):
+            self.food[position] = last
+            self.grid.add_food(self.grid.index(last[0], last[1]), position)
+
+    def _check_over(self):
+        if len(self.body) >= self.config.win_length:
+            self._finish('win')
+        elif self.grid.flags[self._head] & MONSTER:
+            self._finish('lose')
+
+    def _finish(self, result):
+        """Latch the first result and cancel every pending event."""
+        if self.result is None:
+            self.result = result
+            self.scheduler.stop()
+
+    def _step_monster(self, monster):
+        """
+        Step one cell towards the head.
+
+        The original snaps the angle to the head to a multiple of 90 degrees,
+        45 degrees going up, 135 left, 225 down and 315 right; comparing the
+        distances along both axes gives the same steps without trigonometry.
+        """
+        if self.field is not None:
+            self._follow_field(monster)
+            return
+        grid = self.grid
+        grid.remove_monster(grid.index(monster[0], monster[1]))
+        head_row = self._head // grid.stride - 1
+        d_col = self._head - (head_row + 1) * grid.stride - 1 - monster[0]
+        d_row = head_row - monster[1]
+        if d_row > 0 and d_row >= d_col and d_row > -d_col:
+            monster[1] += 1
+        elif d_col < 0 and d_row <= -d_col and d_row > d_col:
+            monster[0] -= 1
+        elif d_row < 0 and d_row <= d_col and d_col < -d_row:
+            monster[1] -= 1
+        else:
+            monster[0] += 1
+        grid.add_monster(grid.index(monster[0], monster[1]))
+
+    def _follow_field(self, monster):
+        """
+        Step to the next cell of the flow field, unless another monster is
+        there; a monster the body cuts off from the head waits.
+        """
+        grid = self.grid
+        k = grid.index(monster[0], monster[1])
+        n = self.field.next_cell(k)
+        if n == k or (grid.flags[n] & MONSTER and n != self._head):
+            return
+        grid.remove_monster(k)
+        grid.add_monster(n)
+        row = n // grid.stride
+        monster[0] = n - row * grid.stride - 1
+        monster[1] = row - 1
+
+    def _touch(self, monster):
+        """Count a contact if the monster is on or next to the snake."""
+        if self.grid.near_snake(self.grid.index(monster[0], monster[1])):
+            self.contacts += 1
+
+    def _move_food(self):
+        """
+        Make a random subset of the food items jump, if the cell is free.
+
+        The subset has a random size and is drawn by selection sampling, in
+        the order of the food list and without building a list.
+        """
+        grid, rng, food = self.grid, self.rng, self.food
+        count = len(food)
+        needed = rng.randint(1, count)
+        for k in range(count):
+            if rng.random() * (count - k) >= needed:
+                continue
+            needed -= 1
+            item = food[k]
+            d_col, d_row = rng.choice(FOOD_JUMPS)
+            col, row = item[0] + d_col, item[1] + d_row
+            if self.config.interior(col, row) and not grid.at(col, row) & FOOD:
+                grid.remove_food(grid.index(item[0], item[1]))
+                item[0] = col
+                item[1] = row
+                grid.add_food(grid.index(col, row), k)